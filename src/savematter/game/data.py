@@ -11,7 +11,7 @@ class Data:
         self.ui = ui
         self._coins = 0
         self._health = 5
-        self.ui.create_hearts(self._health)
+        self.ui.show_hearts(self._health)
 
         self.unlocked_level = 5
         self.current_level = 5
@@ -29,7 +29,7 @@ class Data:
     @health.setter
     def health(self, value: int) -> None:
         self._health = value
-        self.ui.create_hearts(value)
+        self.ui.show_hearts(value)
 
     @coins.setter
     def coins(self, value: int) -> None:
@@ -15,16 +15,24 @@ import pygame
 
 from savematter.game.data import Data
 from savematter.game.player import Player
+from savematter.sprites.collision import CollisionMap
 from savematter.sprites.enemies import Pearl, Shell, Tooth
 from savematter.sprites.groups import AllSprites
-from savematter.sprites.objects import FloorSpike, Spike
+from savematter.sprites.objects import FloorSpike, Spike, SpikeChain
+from savematter.sprites.spatial import SpatialGroup, collide_rect
 from savematter.sprites.sprites import (
     AnimatedSprite,
+    AnimationClocks,
     Item,
     MovingSprite,
     ParticleEffectSprite,
     Sprite,
+    SyncedSprite,
+    TileChunk,
+    WaterRegion,
+    bake_tile_chunks,
 )
+from savematter.utils import backend
 from savematter.utils.settings import (
     ANIM_SPEED,
     TILE_SIZE,
@@ -32,10 +40,11 @@ from savematter.utils.settings import (
     LevelLayers,
     ZLayers,
 )
-from savematter.utils.typing import TYPE_CHECKING, cast
+from savematter.utils.timer import Scheduler
+from savematter.utils.typing import TYPE_CHECKING, Vector2, cast
 
 if TYPE_CHECKING:
-    from pygame import Surface
+    from pygame import Rect, Surface
     from pygame.mixer import Sound
     from pytmx.pytmx import TiledMap, TiledObject
     from pytmx.pytmx import TiledObjectGroup as TiledObjectGroup
@@ -54,7 +63,7 @@ class Level:
         audio_files: dict[str, Sound],
         switch_state: SwitchState,
     ) -> None:
-        self.screen = pygame.display.get_surface()
+        self.screen = backend.get_surface()
         self.data = data
         self.switch_state = switch_state
 
@@ -73,6 +82,9 @@ class Level:
             else None
         )
 
+        # Timers run on the level's own clock and are dropped with it
+        self.scheduler = Scheduler()
+
         # Groups
         self.all_sprites = AllSprites(
             tmx_map.width,
@@ -81,16 +93,22 @@ class Level:
                 "large": cast("list[Surface]", level_frames["cloud_large"]),
                 "small": cast("Surface", level_frames["cloud_small"]),
             },
+            self.scheduler,
             bg_tile,
             tmx_level_properties["top_limit"],
             tmx_level_properties["horizon_line"],
         )
-        self.collision_sprites = pygame.sprite.Group()
+        self.collision_map = CollisionMap(tmx_map.width, tmx_map.height)
+        self.semi_collision_map = CollisionMap(
+            tmx_map.width, tmx_map.height, vertical_merge=False
+        )
+        self.collision_sprites = SpatialGroup()
         self.semi_collision_sprites = pygame.sprite.Group()
-        self.damage_sprites = pygame.sprite.Group()
-        self.tooth_sprites = pygame.sprite.Group()
-        self.pearl_sprites = pygame.sprite.Group()
-        self.item_sprites = pygame.sprite.Group()
+        self.damage_sprites = SpatialGroup()
+        self.tooth_sprites = SpatialGroup()
+        self.pearl_sprites = SpatialGroup()
+        self.item_sprites = SpatialGroup()
+        self.animation_clocks = AnimationClocks()
 
         # Frames
         self.pearl_surf = cast("Surface", level_frames["pearl"])
@@ -114,6 +132,10 @@ class Level:
         audio_files: dict[str, Sound],
     ) -> None:
         # Tiles
+        static_tiles: dict[int, list[tuple[tuple[float, float], Surface]]] = {
+            ZLayers.BG_TILES: [],
+            ZLayers.MAIN: [],
+        }
         for layer in [
             LevelLayers.BG,
             LevelLayers.TERRAIN,
@@ -121,13 +143,14 @@ class Level:
             LevelLayers.PLATFORMS,
         ]:
             for x, y, surf in tmx_map.get_layer_by_name(layer).tiles():
-                groups = []
-                groups.append(self.all_sprites)
+                pos = (x * TILE_SIZE, y * TILE_SIZE)
+
+                # Colliders keep the tile data, drawing goes through the chunks
                 match layer:
                     case LevelLayers.TERRAIN:
-                        groups.append(self.collision_sprites)
+                        self.collision_map.add_tile(x, y)
                     case LevelLayers.PLATFORMS:
-                        groups.append(self.semi_collision_sprites)
+                        self.semi_collision_map.add_tile(x, y)
 
                 match layer:
                     case LevelLayers.BG | LevelLayers.FG:
@@ -135,12 +158,13 @@ class Level:
                     case _:
                         z = ZLayers.MAIN
 
-                Sprite(
-                    (x * TILE_SIZE, y * TILE_SIZE),
-                    surf,
-                    *groups,
-                    z=z,
-                )
+                static_tiles[z].append((pos, surf))
+
+        for z, tiles in static_tiles.items():
+            if tiles:
+                bake_tile_chunks(tiles, self.all_sprites, z=z)
+        self.collision_map.merge()
+        self.semi_collision_map.merge()
 
         obj: TiledObject
         # Static objects
@@ -163,16 +187,20 @@ class Level:
                         z=z,
                     )
                 case _:
-                    AnimatedSprite(
+                    SyncedSprite(
                         (obj.x, obj.y),
-                        cast("FrameList", level_frames[obj.name]),
+                        self.animation_clocks.get(
+                            cast("FrameList", level_frames[obj.name])
+                        ),
                         self.all_sprites,
                         z=z,
                     )
                     if obj.name == "candle":
-                        AnimatedSprite(
+                        SyncedSprite(
                             (obj.x - 20, obj.y - 20),
-                            cast("FrameList", level_frames["candle_light"]),
+                            self.animation_clocks.get(
+                                cast("FrameList", level_frames["candle_light"])
+                            ),
                             self.all_sprites,
                             z=z,
                         )
@@ -193,8 +221,11 @@ class Level:
                         cast("AnimationDict", level_frames["player"]),
                         self.data,
                         audio_files,
+                        self.collision_map,
+                        self.semi_collision_map,
                         self.collision_sprites,
                         self.semi_collision_sprites,
+                        self.scheduler,
                         self.all_sprites,
                     )
                 case "barrel" | "crate":
@@ -232,16 +263,22 @@ class Level:
                     # Z index
                     z = ZLayers.MAIN if "bg" not in obj.name else ZLayers.BG_DETAILS
 
-                    # Anim speed
-                    anim_speed = (
-                        ANIM_SPEED
-                        if "palm" not in obj.name
-                        else ANIM_SPEED + uniform(-1, 1)
-                    )
-
-                    AnimatedSprite(
-                        (obj.x, obj.y), frames, *groups, z=z, anim_speed=anim_speed
-                    )
+                    # Palms keep their own clock so they sway out of step
+                    if "palm" in obj.name:
+                        AnimatedSprite(
+                            (obj.x, obj.y),
+                            frames,
+                            *groups,
+                            z=z,
+                            anim_speed=ANIM_SPEED + uniform(-1, 1),
+                        )
+                    else:
+                        SyncedSprite(
+                            (obj.x, obj.y),
+                            self.animation_clocks.get(frames),
+                            *groups,
+                            z=z,
+                        )
 
             if obj.name == "flag":
                 self.level_finish_rect = pygame.FRect(
@@ -253,7 +290,7 @@ class Level:
             "TiledObjectGroup", tmx_map.get_layer_by_name(LevelLayers.MOVING_OBJS)
         ):
             if obj.name == "spike":
-                Spike(
+                spike = Spike(
                     (obj.x + obj.width / 2, obj.y + obj.height / 2),
                     cast("Surface", level_frames["spike"]),
                     obj.properties["radius"],
@@ -263,15 +300,11 @@ class Level:
                     *(self.all_sprites, self.damage_sprites),
                 )
                 for radius in range(0, obj.properties["radius"], 20):
-                    Spike(
-                        (obj.x + obj.width / 2, obj.y + obj.height / 2),
+                    SpikeChain(
+                        spike,
                         cast("Surface", level_frames["spike_chain"]),
                         radius,
-                        obj.properties["speed"],
-                        obj.properties["start_angle"],
-                        obj.properties["end_angle"],
                         self.all_sprites,
-                        z=ZLayers.BG_DETAILS,
                     )
             else:
                 if obj.name is None:
@@ -309,33 +342,23 @@ class Level:
                 )
 
                 if obj.name == "saw":
+                    chain = cast("Surface", level_frames["saw_chain"])
                     if move_dir == "x":
-                        y = (
-                            start_pos[1]
-                            - cast("Surface", level_frames["saw_chain"]).get_height()
-                            / 2
-                        )
+                        y = start_pos[1] - chain.get_height() / 2
                         left, right = int(start_pos[0]), int(end_pos[0])
-                        for x in range(left, right, 20):
-                            Sprite(
-                                (x, y),
-                                cast("Surface", level_frames["saw_chain"]),
-                                self.all_sprites,
-                                z=ZLayers.BG_DETAILS,
-                            )
+                        links = [(x, y) for x in range(left, right, 20)]
                     else:
-                        x = (
-                            start_pos[0]
-                            - cast("Surface", level_frames["saw_chain"]).get_width() / 2
-                        )
+                        x = start_pos[0] - chain.get_width() / 2
                         top, bottom = int(start_pos[1]), int(end_pos[1])
-                        for y in range(top, bottom, 20):
-                            Sprite(
-                                (x, y),
-                                cast("Surface", level_frames["saw_chain"]),
-                                self.all_sprites,
-                                z=ZLayers.BG_DETAILS,
-                            )
+                        links = [(x, y) for y in range(top, bottom, 20)]
+
+                    # The whole track is baked into one surface
+                    if links:
+                        TileChunk(
+                            [(pos, chain) for pos in links],
+                            self.all_sprites,
+                            z=ZLayers.BG_DETAILS,
+                        )
 
         # Enemies
         for obj in cast(
@@ -346,7 +369,9 @@ class Level:
                     Tooth(
                         (obj.x, obj.y),
                         cast("FrameList", level_frames["tooth"]),
+                        self.collision_map,
                         self.collision_sprites,
+                        self.scheduler,
                         *(self.all_sprites, self.damage_sprites, self.tooth_sprites),
                     )
                 case "shell":
@@ -356,6 +381,7 @@ class Level:
                         obj.properties["reverse"],
                         self.player,
                         self.create_perl,
+                        self.scheduler,
                         *(self.all_sprites, self.collision_sprites),
                     )
 
@@ -375,31 +401,21 @@ class Level:
             )
 
         # Water
+        water_clock = self.animation_clocks.get(
+            cast("FrameList", level_frames["water_top"])
+        )
         for obj in cast(
             "TiledObjectGroup", tmx_map.get_layer_by_name(LevelLayers.WATER)
         ):
             rows = int(obj.height / TILE_SIZE)
             cols = int(obj.width / TILE_SIZE)
 
-            for row in range(rows):
-                for col in range(cols):
-                    x = obj.x + col * TILE_SIZE
-                    y = obj.y + row * TILE_SIZE
-
-                    if row == 0:
-                        AnimatedSprite(
-                            (x, y),
-                            cast("FrameList", level_frames["water_top"]),
-                            self.all_sprites,
-                            z=ZLayers.WATER,
-                        )
-                    else:
-                        Sprite(
-                            (x, y),
-                            cast("Surface", level_frames["water_body"]),
-                            self.all_sprites,
-                            z=ZLayers.WATER,
-                        )
+            WaterRegion(
+                pygame.FRect(obj.x, obj.y, cols * TILE_SIZE, rows * TILE_SIZE),
+                water_clock,
+                cast("Surface", level_frames["water_body"]),
+                self.all_sprites,
+            )
 
     def create_perl(self, pos: tuple[float, float], direction: int) -> None:
         Pearl(
@@ -407,108 +423,89 @@ class Level:
             self.pearl_surf,
             direction,
             150,
+            self.scheduler,
             *(self.all_sprites, self.damage_sprites, self.pearl_sprites),
         )
         self.pearl_sound.play()
 
     def collisions(self) -> None:
-        def hitbox_collide(sprite1: Player, sprite2: Sprite) -> bool:
-            sprite1_rect = (
-                sprite1.hitbox if hasattr(sprite1, "hitbox") else sprite1.rect  # pyright: ignore[reportAttributeAccessIssue]
-            )
-            sprite2_rect = (
-                sprite2.hitbox if hasattr(sprite2, "hitbox") else sprite2.rect  # pyright: ignore[reportAttributeAccessIssue]
-            )
+        for group in (
+            self.collision_sprites,
+            self.damage_sprites,
+            self.tooth_sprites,
+            self.pearl_sprites,
+            self.item_sprites,
+        ):
+            group.refresh()
 
-            if sprite1_rect is None or sprite2_rect is None:
+        # Pearl
+        pearl: Pearl
+        for pearl in self.pearl_sprites.sprites():
+            if pearl.rect is None:
                 raise TypeError("Sprite rect is empty")
 
-            return sprite1_rect.colliderect(sprite2_rect)
-
-        sprite: Sprite
-        # Pearl
-        for sprite in self.collision_sprites:
-            sprites: list[Sprite] = pygame.sprite.spritecollide(
-                sprite,
-                self.pearl_sprites,
-                True,
-                hitbox_collide,  # pyright: ignore[reportArgumentType]
+            hit_wall = self.collision_map.collides(pearl.rect) or any(
+                self.collision_sprites.collide(pearl.rect)
             )
-
-            if sprites:
-                if sprites[0].rect is None:
-                    raise TypeError("Sprite rect is empty")
-
+            if hit_wall:
+                pearl.kill()
                 ParticleEffectSprite(
-                    (sprites[0].rect.center),
+                    (pearl.rect.center),
                     self.particle_frames,
                     self.all_sprites,
                 )
 
         # Damage
-        for sprite in self.damage_sprites:
-            sprite_rect = sprite.hitbox if hasattr(sprite, "hitbox") else sprite.rect  # pyright: ignore[reportAttributeAccessIssue]
+        for sprite in self.damage_sprites.collide(self.player.hitbox):
+            self.player.get_damage()
+            self.damage_sound.play()
 
-            if sprite_rect is None:
-                raise TypeError("Sprite rect is empty")
-
-            if sprite_rect.colliderect(self.player.hitbox):
-                self.player.get_damage()
-                self.damage_sound.play()
-
-                if hasattr(sprite, "pearl"):
-                    sprite.kill()
-                    ParticleEffectSprite(
-                        (sprite_rect.center),
-                        self.particle_frames,
-                        self.all_sprites,
-                    )
-
-        # Items
-        if self.item_sprites:
-            item_sprites: list[Item] = pygame.sprite.spritecollide(
-                self.player,
-                self.item_sprites,
-                True,
-                hitbox_collide,  # pyright: ignore[reportArgumentType]
-            )
-            if item_sprites:
-                if item_sprites[0].rect is None:
-                    raise TypeError("Sprite rect is empty")
-
-                item_sprites[0].activate()
+            if hasattr(sprite, "pearl"):
+                sprite.kill()
                 ParticleEffectSprite(
-                    (item_sprites[0].rect.center),
+                    (collide_rect(sprite).center),
                     self.particle_frames,
                     self.all_sprites,
                 )
-                self.coin_sound.play()
-
-        # Player attack
-        targets: list[Tooth | Pearl] = (
-            self.pearl_sprites.sprites() + self.tooth_sprites.sprites()
-        )
 
-        target: Tooth | Pearl
-        for target in targets:
-            target_rect = target.hitbox if hasattr(target, "hitbox") else target.rect  # pyright: ignore[reportAttributeAccessIssue]
+        # Items
+        item_sprites: list[Item] = self.item_sprites.collide(self.player.hitbox)  # pyright: ignore[reportAssignmentType]
+        if item_sprites:
+            for item in item_sprites:
+                item.kill()
 
-            if self.player.rect is None or target_rect is None:
-                raise TypeError("Player or target rect is empty")
+            if item_sprites[0].rect is None:
+                raise TypeError("Sprite rect is empty")
 
-            facing_target = (
-                self.player.rect.centerx < target_rect.centerx
-                and self.player.facing_right
-                or self.player.rect.centerx > target_rect.centerx
-                and not self.player.facing_right
+            item_sprites[0].activate()
+            ParticleEffectSprite(
+                (item_sprites[0].rect.center),
+                self.particle_frames,
+                self.all_sprites,
             )
+            self.coin_sound.play()
 
-            if (
-                target_rect.colliderect(self.player.rect)
-                and self.player.attacking
-                and facing_target
-            ):
-                target.reverse()
+        # Player attack
+        if self.player.rect is None:
+            raise TypeError("Player rect is empty")
+
+        if self.player.attacking:
+            targets: list[Tooth | Pearl] = self.pearl_sprites.collide(
+                self.player.rect
+            ) + self.tooth_sprites.collide(self.player.rect)  # pyright: ignore[reportAssignmentType]
+
+            target: Tooth | Pearl
+            for target in targets:
+                target_rect = collide_rect(target)
+                facing_target = (
+                    self.player.rect.centerx < target_rect.centerx
+                    and self.player.facing_right
+                    or self.player.rect.centerx > target_rect.centerx
+                    and not self.player.facing_right
+                )
+
+                if facing_target:
+                    target.reverse()
 
         ## Borders
         # Horizontal
@@ -525,13 +522,30 @@ class Level:
         if self.player.hitbox.colliderect(self.level_finish_rect):
             self.switch_state(GameState.OVERWORLD, self.level_unlock)
 
-    def run(self, dt: float) -> None:
+    def update(self, dt: float) -> None:
+        self.scheduler.advance(dt)
+        self.animation_clocks.update(dt)
+        self.all_sprites.update(dt)
+        self.collisions()
+
+    def draw(self, alpha: float = 1) -> None:
+        """Draw the level, alpha of the way from the last step to this one."""
         if self.screen is None:
             raise TypeError("Display surface is empty")
 
         self.screen.fill("black")
 
-        self.all_sprites.update(dt)
-        self.collisions()
+        # The player's old_rect is its hitbox before the last step
+        target = Vector2(self.player.hitbox.center)
+        if alpha != 1:
+            target = Vector2(self.player.old_rect.center).lerp(target, alpha)
+        self.all_sprites.draw_camera((target.x, target.y), alpha)
+        self.animation_clocks.drawn()
+
+    def dirty_rects(self) -> list[Rect] | None:
+        return self.all_sprites.dirty_rects()
 
-        self.all_sprites.draw_camera(self.player.hitbox.center, dt)
+    @property
+    def idle(self) -> bool:
+        """Whether frames can be paced at IDLE_FPS, never during a level."""
+        return False
@@ -6,7 +6,13 @@ import pygame
 
 from savematter.sprites.groups import WorldSprites
 from savematter.sprites.overworld import Node, PlayerIcon, WalkPath
-from savematter.sprites.sprites import AnimatedSprite, Sprite
+from savematter.sprites.sprites import (
+    AnimationClocks,
+    Sprite,
+    SyncedSprite,
+    WaterRegion,
+)
+from savematter.utils import backend
 from savematter.utils.settings import (
     TILE_SIZE,
     GameState,
@@ -15,7 +21,7 @@ from savematter.utils.settings import (
 from savematter.utils.typing import TYPE_CHECKING, Vector2, cast
 
 if TYPE_CHECKING:
-    from pygame import Surface
+    from pygame import Rect, Surface
     from pytmx.pytmx import TiledMap, TiledObject
     from pytmx.pytmx import TiledObjectGroup as TiledObjectGroup
 
@@ -33,13 +39,14 @@ class Overworld:
         ],
         switch_state: SwitchState,
     ) -> None:
-        self.screen = pygame.display.get_surface()
+        self.screen = backend.get_surface()
         self.data = data
         self.switch_state = switch_state
 
         # Groups
         self.all_sprites = WorldSprites(self.data)
         self.node_sprites = pygame.sprite.Group()
+        self.animation_clocks = AnimationClocks()
 
         self.setup(tmx_map, overworld_frames)
 
@@ -69,14 +76,16 @@ class Overworld:
                 )
 
         # Water
-        for col in range(tmx_map.width):
-            for row in range(tmx_map.height):
-                AnimatedSprite(
-                    (col * TILE_SIZE, row * TILE_SIZE),
-                    cast("FrameList", overworld_frames["water"]),
-                    self.all_sprites,
-                    z=ZLayers.BG,
-                )
+        water_clock = self.animation_clocks.get(
+            cast("FrameList", overworld_frames["water"])
+        )
+        WaterRegion(
+            pygame.FRect(0, 0, tmx_map.width * TILE_SIZE, tmx_map.height * TILE_SIZE),
+            water_clock,
+            None,
+            self.all_sprites,
+            z=ZLayers.BG,
+        )
 
         # Objects
         obj: TiledObject
@@ -86,12 +95,14 @@ class Overworld:
 
             match obj.name:
                 case "palm":
-                    AnimatedSprite(
+                    SyncedSprite(
                         (obj.x, obj.y),
-                        cast("FrameList", overworld_frames["palms"]),
+                        self.animation_clocks.get(
+                            cast("FrameList", overworld_frames["palms"]),
+                            randint(4, 6),
+                        ),
                         self.all_sprites,
                         z=ZLayers.MAIN,
-                        anim_speed=randint(4, 6),
                     )
                 case _:
                     if obj.image is None:
@@ -253,14 +264,29 @@ class Overworld:
         if nodes:
             self.current_node = nodes[0]
 
-    def run(self, dt: float) -> None:
+    def update(self, dt: float) -> None:
+        self.input()
+        self.get_curr_node()
+        self.animation_clocks.update(dt)
+        self.all_sprites.update(dt)
+
+    def draw(self, alpha: float = 1) -> None:
+        """Draw the overworld, alpha of the way from the last step to this one."""
         if self.screen is None:
             raise TypeError("Display surface is empty")
 
         if self.player_icon.rect is None:
             raise TypeError("Player icon rect is empty")
 
-        self.input()
-        self.get_curr_node()
-        self.all_sprites.update(dt)
-        self.all_sprites.draw_camera(self.player_icon.rect.center)
+        pos = self.all_sprites.interpolate(self.player_icon, alpha)
+        target = self.player_icon.rect.move_to(topleft=pos).center
+        self.all_sprites.draw_camera(target, alpha)
+        self.animation_clocks.drawn()
+
+    def dirty_rects(self) -> list[Rect] | None:
+        return self.all_sprites.dirty_rects()
+
+    @property
+    def idle(self) -> bool:
+        """Whether frames can be paced at IDLE_FPS, while the icon stands still."""
+        return not self.player_icon.path
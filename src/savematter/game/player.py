@@ -6,6 +6,7 @@ import pygame
 
 from savematter.game.data import Data
 from savematter.sprites.sprites import StateAnimatedSprite
+from savematter.utils.assets import AssetManager
 from savematter.utils.timer import Timer
 from savematter.utils.typing import TYPE_CHECKING, Vector2
 
@@ -13,7 +14,9 @@ if TYPE_CHECKING:
     from pygame.mixer import Sound
     from pygame.sprite import Group
 
+    from savematter.sprites.collision import Collider, CollisionMap
     from savematter.sprites.sprites import MovingSprite, Sprite
+    from savematter.utils.timer import Scheduler
     from savematter.utils.typing import AnimationDict
 
 
@@ -24,8 +27,11 @@ class Player(StateAnimatedSprite):
         frames: AnimationDict,
         data: Data,
         audio_files: dict[str, Sound],
+        collision_map: CollisionMap,
+        semi_collision_map: CollisionMap,
         collision_sprites: Group,
         semi_collision_sprites: Group,
+        scheduler: Scheduler,
         *groups: Group,
     ) -> None:
         super().__init__(pos, "idle", frames, *groups)
@@ -33,6 +39,11 @@ class Player(StateAnimatedSprite):
 
         # Image
         self.facing_right = True
+        self.flipped_frames = AssetManager.mirrored_states(frames)
+        self.silhouette_frames = {
+            True: AssetManager.silhouette_states(frames),
+            False: AssetManager.silhouette_states(self.flipped_frames),
+        }
 
         # Rects
         if self.rect is None:
@@ -50,18 +61,21 @@ class Player(StateAnimatedSprite):
         self.attacking = False
 
         # Collision
+        self.collision_map = collision_map
+        self.semi_collision_map = semi_collision_map
         self.collision_sprites = collision_sprites
         self.semi_collision_sprites = semi_collision_sprites
         self.on_surf = {"floor": False, "left": False, "right": False}
         self.platform = None
 
         # Timer
+        self.scheduler = scheduler
         self.timers = {
-            "wall_jump": Timer(400),
-            "wall_slide_block": Timer(250),
-            "platform_fall": Timer(100),
-            "attack_block": Timer(500),
-            "immunity_frames": Timer(650),
+            "wall_jump": Timer(400, scheduler=scheduler),
+            "wall_slide_block": Timer(250, scheduler=scheduler),
+            "platform_fall": Timer(100, scheduler=scheduler),
+            "attack_block": Timer(500, scheduler=scheduler),
+            "immunity_frames": Timer(650, scheduler=scheduler),
         }
 
         # Sounds
@@ -157,11 +171,16 @@ class Player(StateAnimatedSprite):
             (contact_thickness, self.hitbox.height / 2),
         )
 
+        contact_area = self.hitbox.inflate(contact_thickness * 2, contact_thickness * 2)
         collide_rects = [
+            collider.rect for collider in self.collision_map.query(contact_area)
+        ] + [
             sprite.hitbox if hasattr(sprite, "hitbox") else sprite.rect
             for sprite in self.collision_sprites
         ]
         semi_collide_rects = [
+            collider.rect for collider in self.semi_collision_map.query(floor_rect)
+        ] + [
             sprite.hitbox if hasattr(sprite, "hitbox") else sprite.rect
             for sprite in self.semi_collision_sprites
         ]
@@ -194,8 +213,11 @@ class Player(StateAnimatedSprite):
                 self.platform = sprite
 
     def collision(self, axis) -> None:
-        sprite: Sprite
-        for sprite in self.collision_sprites:
+        sprite: Sprite | Collider
+        for sprite in [
+            *self.collision_map.query(self.hitbox),
+            *self.collision_sprites,
+        ]:
             sprite_rect = sprite.hitbox if hasattr(sprite, "hitbox") else sprite.rect  # pyright: ignore[reportAttributeAccessIssue]
 
             if sprite_rect is None:
@@ -236,8 +258,11 @@ class Player(StateAnimatedSprite):
 
     def semi_collision(self) -> None:
         if not self.timers["platform_fall"].active:
-            sprite: Sprite
-            for sprite in self.semi_collision_sprites:
+            sprite: Sprite | Collider
+            for sprite in [
+                *self.semi_collision_map.query(self.hitbox),
+                *self.semi_collision_sprites,
+            ]:
                 if sprite.rect is None:
                     raise TypeError("Sprite rect is empty")
 
@@ -257,18 +282,9 @@ class Player(StateAnimatedSprite):
             self.timers["immunity_frames"].activate()
 
     def flicker(self) -> None:
-        if self.timers["immunity_frames"].active and sin(pygame.time.get_ticks()) >= 0:
-            if self.image is None:
-                raise TypeError("Player image is empty")
-
-            white_mask = pygame.mask.from_surface(self.image)
-            white_surf = white_mask.to_surface()
-            white_surf.set_colorkey("black")
-            self.image = white_surf
-
-    def update_timers(self) -> None:
-        for timer in self.timers.values():
-            timer.update()
+        if self.timers["immunity_frames"].active and sin(self.scheduler.time) >= 0:
+            frames = self.silhouette_frames[self.facing_right][self.state]
+            self.image = frames[int(self.frame_index) % len(frames)]
 
     def get_anim_state(self) -> None:
         if self.on_surf["floor"]:
@@ -287,21 +303,14 @@ class Player(StateAnimatedSprite):
         self.frame_index += self.anim_speed * dt
         if self.state == "attack" and self.frame_index >= len(self.frames[self.state]):
             self.state = "idle"
-        self.image = self.frames[self.state][
-            int(self.frame_index) % len(self.frames[self.state])
-        ]
-        self.image = (
-            self.image
-            if self.facing_right
-            else pygame.transform.flip(self.image, True, False)
-        )
+        frames = self.frames if self.facing_right else self.flipped_frames
+        self.image = frames[self.state][int(self.frame_index) % len(frames[self.state])]
 
         if self.attacking and self.frame_index > len(self.frames[self.state]):
             self.attacking = False
 
     def update(self, dt: float) -> None:
         self.old_rect = self.hitbox.copy()
-        self.update_timers()
         self.input()
         self.move(dt)
         self.check_contact()
@@ -1,27 +1,58 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+
 import pygame
 
 from savematter.sprites.sprites import AnimatedSprite
+from savematter.utils import backend
 from savematter.utils.settings import ZLayers
 from savematter.utils.timer import Timer
 from savematter.utils.typing import TYPE_CHECKING, cast
 
 if TYPE_CHECKING:
-    from pygame import Surface
+    from pygame import FRect, Rect, Surface
     from pygame.font import Font
 
-    from savematter.sprites.sprites import Sprite
     from savematter.utils.typing import AnimationDict, FrameList
 
 
+class TextCache:
+    """
+    Rendered text surfaces keyed by (font, text, colour).
+
+    Once full, the least recently rendered entry makes room for a new one.
+    """
+
+    def __init__(self, size: int = 64) -> None:
+        self.size = size
+        self.surfaces: OrderedDict[tuple[Font, str, str, bool], Surface] = OrderedDict()
+
+    def render(
+        self, font: Font, text: str, color: str, antialias: bool = False
+    ) -> Surface:
+        key = (font, text, color, antialias)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            return surf
+
+        surf = self.surfaces[key] = font.render(text, antialias, color)
+        if len(self.surfaces) > self.size:
+            self.surfaces.popitem(last=False)
+        return surf
+
+
+text_cache = TextCache()
+
+
 class UI:
     def __init__(
         self,
         fonts: dict[str, Font],
         frames: dict[str, Surface | FrameList | dict[str, Surface] | AnimationDict],
     ) -> None:
-        self.screen = pygame.display.get_surface()
+        self.screen = backend.get_display()
         self.sprites = pygame.sprite.Group()
         self.fonts = fonts
 
@@ -29,51 +60,125 @@ class UI:
         self.heart_frames = cast("FrameList", frames["heart"])
         self.heart_surf_width = self.heart_frames[0].get_width()
         self.heart_padding = 5
+        self.hearts: list[Heart] = []  # Pool, the first heart_count are shown
+        self.heart_count = 0
 
         # Coins
         self.coin_surf = cast("Surface", frames["coin"])
-        self.coin_timer = Timer(1000)
+        self.coin_timer = Timer(1000, self.hud_changed)
         self.coin_amount = 0
+        self.render_coins()
+
+        # HUD layer, the resting hearts and the coin counter. It is
+        # recomposited when health or coins change, the hearts' animation
+        # frames are blitted over it.
+        self.hud_surf: Surface | None = None
+        self.hud_rect = pygame.Rect()
+        self.hud_dirty = True
+
+        # Dirty rects
+        self.dirty: list[Rect] = []
+        self.last_dirty: list[Rect] = []
 
     # Hearts
-    def create_hearts(self, amount: int) -> None:
-        sprite: Sprite
-        for sprite in self.sprites:
-            sprite.kill()
-        for heart in range(amount):
-            x = 10 + heart * (self.heart_surf_width + self.heart_padding)
+    def show_hearts(self, amount: int) -> None:
+        """Show some hearts, adding or removing only the difference."""
+        amount = max(amount, 0)
+        while len(self.hearts) < amount:
+            x = 10 + len(self.hearts) * (self.heart_surf_width + self.heart_padding)
             y = 10
-            Heart((x, y), self.heart_frames, self.sprites)
-
-    # Coins
-    def display_text(self) -> None:
-        if self.screen is None:
-            raise TypeError("Display surface is empty")
+            self.hearts.append(Heart((x, y), self.heart_frames))
 
-        if self.coin_timer.active:
-            text_surf = self.fonts["main"].render(
-                str(self.coin_amount), False, "#33323d"
-            )
-            text_rect = text_surf.get_frect(topleft=(16, 34))
-            self.screen.blit(text_surf, text_rect)
+        # Hidden hearts stay pooled and keep their animation state
+        for heart in self.hearts[self.heart_count : amount]:
+            heart.add(self.sprites)
+        for heart in self.hearts[amount : self.heart_count]:
+            heart.remove(self.sprites)
+        if amount != self.heart_count:
+            self.hud_changed()
+        self.heart_count = amount
 
-            coin_rect = self.coin_surf.get_frect(center=text_rect.bottomleft).move(
-                0, -6
-            )
-            self.screen.blit(self.coin_surf, coin_rect)
+    # Coins
+    def render_coins(self) -> None:
+        self.text_surf = text_cache.render(
+            self.fonts["main"], str(self.coin_amount), "#33323d"
+        )
+        self.text_rect = self.text_surf.get_frect(topleft=(16, 34))
+        self.coin_rect = self.coin_surf.get_frect(
+            center=self.text_rect.bottomleft
+        ).move(0, -6)
 
     def show_coins(self, amount: int) -> None:
-        self.coin_amount = amount
+        if amount != self.coin_amount:
+            self.coin_amount = amount
+            self.render_coins()
+            self.hud_changed()
+        elif not self.coin_timer.active:
+            self.hud_changed()
         self.coin_timer.activate()
 
+    # HUD
+    def hud_changed(self) -> None:
+        self.hud_dirty = True
+
+    def hud_contents(self) -> list[tuple[Surface, Rect]]:
+        """The images on the HUD layer and the rects they are blitted to."""
+        contents: list[tuple[Surface, FRect]] = [
+            (self.heart_frames[0], heart.rect)  # pyright: ignore[reportAssignmentType]
+            for heart in self.hearts[: self.heart_count]
+        ]
+        if self.coin_timer.active:
+            contents.append((self.text_surf, self.text_rect))
+            contents.append((self.coin_surf, self.coin_rect))
+
+        # Blits truncate the position
+        return [
+            (surf, pygame.Rect(int(rect.x), int(rect.y), *surf.size))
+            for surf, rect in contents
+        ]
+
+    def compose_hud(self) -> None:
+        self.hud_dirty = False
+        contents = self.hud_contents()
+        if not contents:
+            self.hud_surf = None
+            return
+
+        self.hud_rect = contents[0][1].unionall([rect for _, rect in contents])
+        # Reused while the layer keeps its size, a new surface would also be
+        # a new texture on the texture backend
+        if self.hud_surf is None or self.hud_surf.size != self.hud_rect.size:
+            self.hud_surf = pygame.Surface(self.hud_rect.size, pygame.SRCALPHA)
+        else:
+            self.hud_surf.fill((0, 0, 0, 0))
+        # Blending onto fully transparent pixels copies the source as is
+        self.hud_surf.fblits(
+            [
+                (surf, rect.move(-self.hud_rect.x, -self.hud_rect.y))
+                for surf, rect in contents
+            ]
+        )
+
     def update(self, dt: float) -> None:
         if self.screen is None:
             raise TypeError("Display surface is empty")
 
-        self.coin_timer.update()
+        self.last_dirty, self.dirty = self.dirty, []
         self.sprites.update(dt)
-        self.sprites.draw(self.screen)
-        self.display_text()
+        if self.hud_dirty:
+            self.compose_hud()
+        if self.hud_surf is None:
+            return
+
+        self.dirty.append(self.screen.blit(self.hud_surf, self.hud_rect))
+        # Every heart frame covers the resting one, so it can be drawn over it
+        for heart in self.hearts[: self.heart_count]:
+            if heart.image is not self.heart_frames[0]:
+                self.screen.blit(heart.image, heart.rect)  # pyright: ignore[reportArgumentType]
+
+    def dirty_rects(self) -> list[Rect]:
+        """The HUD rects drawn this frame and last frame."""
+        return self.last_dirty + self.dirty
 
 
 class Heart(AnimatedSprite):
@@ -97,12 +202,7 @@ class Heart(AnimatedSprite):
             self.frame_index = 0
             self.timers["heart_anim_block"].activate()
 
-    def update_timers(self) -> None:
-        for timer in self.timers.values():
-            timer.update()
-
     def update(self, dt: float) -> None:
-        self.update_timers()
         if self.animating:
             super().update(dt)
         else:
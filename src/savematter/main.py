@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import argparse
 import logging
 import sys
 
@@ -9,13 +10,27 @@ from savematter.game.data import Data
 from savematter.game.level import Level
 from savematter.game.overworld import Overworld
 from savematter.game.ui import UI
+from savematter.utils import backend
 from savematter.utils.assets import AssetManager
+from savematter.utils.debug import debug
+from savematter.utils.pacing import FramePacer
 from savematter.utils.settings import (
+    DEBUG_OVERLAY,
+    DIRTY_RECTS,
+    DYNAMIC_RESOLUTION,
     FPS,
+    FRAME_PACING,
+    IDLE_FPS,
+    INTERPOLATE,
+    MAX_SIM_STEPS,
+    RENDER_BACKEND,
+    RENDER_SCALE,
+    SIM_RATE,
     WINDOW_H,
     WINDOW_W,
     GameState,
 )
+from savematter.utils.timer import game_scheduler
 from savematter.utils.typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -23,14 +38,30 @@ if TYPE_CHECKING:
 
 
 class Game:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        render_backend: str = RENDER_BACKEND,
+        render_scale: float = RENDER_SCALE,
+        dynamic_resolution: bool = DYNAMIC_RESOLUTION,
+        frame_pacing: bool = FRAME_PACING,
+    ) -> None:
         logging.basicConfig(level=logging.DEBUG)
 
         pygame.init()
-        self.screen = pygame.display.set_mode((WINDOW_W, WINDOW_H))
-        pygame.display.set_caption("Save the Matter!")
+        self.screen = backend.set_mode(
+            (WINDOW_W, WINDOW_H),
+            "Save the Matter!",
+            render_backend,
+            render_scale,
+            dynamic_resolution,
+        )
+        self.resolution = backend.get_resolution() if dynamic_resolution else None
         self.clock = pygame.time.Clock()
 
+        # Fixed timestep, time not yet simulated
+        self.step = 1 / SIM_RATE if SIM_RATE else 0
+        self.accumulator = 0.0
+
         # Asset loading
         self.assets = AssetManager()
         self.level_frames = self.assets.level_frames
@@ -50,6 +81,9 @@ class Game:
         self.music_files["bg"].set_volume(0.5)
         self.music_files["bg"].play(-1)
 
+        # Created last so loading does not count against the first frame
+        self.pacer = FramePacer(FPS, IDLE_FPS) if frame_pacing else None
+
     def setup_states(self) -> None:
         self.current_state = Level(
             self.tmx_maps[self.data.current_level],
@@ -73,6 +107,8 @@ class Game:
             unlock = unlock if unlock >= self.data.unlocked_level else None
 
         logging.debug(f"Switching to {target}, unlock={unlock}")
+        if self.pacer is not None:
+            logging.debug(f"Frame times: {self.pacer.stats()}")
         match target:
             case GameState.LEVEL:
                 self.current_state = Level(
@@ -96,13 +132,23 @@ class Game:
 
     def run(self) -> None:
         while True:
-            dt = self.clock.tick(FPS) / 1000
+            dt = self.tick()
+            if self.resolution is not None:
+                # Paced frames always fill the budget, only the work counts
+                work = dt if self.pacer is None else self.pacer.work
+                self.resolution.update(work)
             self.handle_events()
 
             self.check_game_over()
             self.update(dt)
             self.render()
 
+    def tick(self) -> float:
+        """Wait for the next frame, returns the frame time in seconds."""
+        if self.pacer is None:
+            return self.clock.tick(FPS) / 1000
+        return self.pacer.tick(self.current_state.idle)
+
     def check_game_over(self) -> None:
         if self.data.health <= 0:
             pygame.quit()
@@ -114,14 +160,73 @@ class Game:
                 pygame.quit()
                 sys.exit()
 
+    def simulate(self, dt: float) -> float:
+        """
+        Advance the current state by the frame time.
+
+        Returns:
+            How far the frame is between the last step and the next one,
+            for drawing.
+        """
+        if not self.step:
+            self.current_state.update(dt)
+            return 1
+
+        # Clamped, so a long frame cannot snowball into ever more steps
+        self.accumulator = min(self.accumulator + dt, self.step * MAX_SIM_STEPS)
+        while self.accumulator >= self.step:
+            # A step can switch states, the next one goes to the new state
+            self.current_state.update(self.step)
+            self.accumulator -= self.step
+        return self.accumulator / self.step if INTERPOLATE else 1
+
     def update(self, dt: float) -> None:
-        self.current_state.run(dt)
+        alpha = self.simulate(dt)
+        self.current_state.draw(alpha)
+        if DEBUG_OVERLAY:
+            debug(f"{self.current_state.all_sprites.frame_updates} sprite updates")
+        backend.upscale()
+        game_scheduler.advance(dt)
         self.ui.update(dt)
 
     def render(self) -> None:
-        pygame.display.update()
+        if DIRTY_RECTS:
+            rects = self.current_state.dirty_rects()
+            # None means the camera scrolled, so the whole screen changed
+            if rects is not None:
+                backend.update(rects + self.ui.dirty_rects())
+                return
+
+        backend.update()
 
 
 def main():
-    game = Game()
+    parser = argparse.ArgumentParser(prog="savematter")
+    parser.add_argument(
+        "--backend",
+        choices=("surface", "texture"),
+        default=RENDER_BACKEND,
+        help="draw on the display surface or through an SDL renderer",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=RENDER_SCALE,
+        help="scene resolution as a fraction of the window",
+    )
+    parser.add_argument(
+        "--dynamic-resolution",
+        action=argparse.BooleanOptionalAction,
+        default=DYNAMIC_RESOLUTION,
+        help="adjust the scene resolution to the frame time",
+    )
+    parser.add_argument(
+        "--frame-pacing",
+        action=argparse.BooleanOptionalAction,
+        default=FRAME_PACING,
+        help="sleep out the frame budget instead of running uncapped",
+    )
+    args = parser.parse_args()
+
+    game = Game(args.backend, args.scale, args.dynamic_resolution, args.frame_pacing)
     game.run()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import pygame
+
+from savematter.utils.settings import TILE_SIZE
+from savematter.utils.typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pygame import FRect, Rect
+
+
+class Collider:
+    """Static solid area, shaped like a sprite for the collision code."""
+
+    def __init__(self, rect: FRect) -> None:
+        self.rect = rect
+        self.old_rect = rect
+
+
+class CollisionMap:
+    """
+    Tile grid of static colliders.
+
+    A rect only looks up the cells it overlaps, so queries cost the same no
+    matter how big the level is. Solid tiles are merged into larger rects by
+    merge() once the layer has been read.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        tile_size: int = TILE_SIZE,
+        vertical_merge: bool = True,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.vertical_merge = vertical_merge
+        self.solid = [[False for _ in range(width)] for _ in range(height)]
+        self.grid: list[list[Collider | None]] = [
+            [None for _ in range(width)] for _ in range(height)
+        ]
+        self.colliders: list[Collider] = []
+
+    def add_tile(self, x: int, y: int) -> None:
+        """Mark the tile at grid position (x, y) as solid."""
+        self.solid[y][x] = True
+
+    def merge(self) -> None:
+        """
+        Greedily merge the solid tiles into maximal rects.
+
+        Each run of free solid tiles in a row is grown downwards while the rows
+        below are solid and free across its whole width. Semi-collision layers
+        only collide on their top edge, so they disable vertical_merge to keep
+        every platform top.
+        """
+        solid, grid, size = self.solid, self.grid, self.tile_size
+        self.colliders.clear()
+        for row in grid:
+            row[:] = [None] * self.width
+
+        for y in range(self.height):
+            x = 0
+            while x < self.width:
+                if not solid[y][x] or grid[y][x] is not None:
+                    x += 1
+                    continue
+
+                # Width
+                right = x
+                while (
+                    right + 1 < self.width
+                    and solid[y][right + 1]
+                    and grid[y][right + 1] is None
+                ):
+                    right += 1
+
+                # Height
+                bottom = y
+                while (
+                    self.vertical_merge
+                    and bottom + 1 < self.height
+                    and all(solid[bottom + 1][x : right + 1])
+                    and not any(grid[bottom + 1][x : right + 1])
+                ):
+                    bottom += 1
+
+                collider = Collider(
+                    pygame.FRect(
+                        x * size,
+                        y * size,
+                        (right - x + 1) * size,
+                        (bottom - y + 1) * size,
+                    )
+                )
+                self.colliders.append(collider)
+                for row in grid[y : bottom + 1]:
+                    row[x : right + 1] = [collider] * (right - x + 1)
+                x = right + 1
+
+    def query(self, rect: Rect | FRect) -> list[Collider]:
+        """Return the colliders in the cells overlapped by a rect."""
+        size = self.tile_size
+        left = max(int(rect.left // size), 0)
+        top = max(int(rect.top // size), 0)
+        right = min(int(rect.right // size), self.width - 1)
+        bottom = min(int(rect.bottom // size), self.height - 1)
+        # Off the map, negative bounds would slice from the end of the grid
+        if right < left or bottom < top:
+            return []
+
+        # A merged collider spans several cells
+        colliders: dict[Collider, None] = {}
+        for row in self.grid[top : bottom + 1]:
+            for collider in row[left : right + 1]:
+                if collider is not None:
+                    colliders[collider] = None
+        return list(colliders)
+
+    def collides(self, rect: Rect | FRect) -> bool:
+        return any(collider.rect.colliderect(rect) for collider in self.query(rect))
@@ -6,6 +6,7 @@ import pygame
 
 from savematter.game.player import Player
 from savematter.sprites.sprites import AnimatedSprite, Sprite, StateAnimatedSprite
+from savematter.utils.assets import AssetManager
 from savematter.utils.timer import Timer
 from savematter.utils.typing import TYPE_CHECKING, Vector2
 
@@ -13,6 +14,8 @@ if TYPE_CHECKING:
     from pygame import Surface
     from pygame.sprite import Group
 
+    from savematter.sprites.collision import CollisionMap
+    from savematter.utils.timer import Scheduler
     from savematter.utils.typing import AnimationDict, Callable, FrameList
 
 
@@ -21,19 +24,23 @@ class Tooth(AnimatedSprite):
         self,
         pos: tuple[float, float],
         frames: FrameList,
+        collision_map: CollisionMap,
         collision_sprites: Group,
+        scheduler: Scheduler,
         *groups: Group,
     ) -> None:
         super().__init__(pos, frames, *groups)
+        self.flipped_frames = AssetManager.mirrored_frames(frames)
 
         # Collision
-        self.collision_rects = [sprite.rect for sprite in collision_sprites]
+        self.collision_map = collision_map
+        self.collision_sprites = collision_sprites
 
         # Movement
         self.direction = choice((-1, 1))
         self.speed = 200
 
-        self.reverse_timer = Timer(250)
+        self.reverse_timer = Timer(250, scheduler=scheduler)
 
     def move(self, dt: float):
         if self.rect is None:
@@ -51,12 +58,18 @@ class Tooth(AnimatedSprite):
             self.rect.topleft + Vector2(-1, 0), (self.rect.width + 2, 1)
         )
 
+        # Only the tiles around the probes
+        collision_rects = [
+            collider.rect
+            for collider in self.collision_map.query(self.rect.inflate(2, 2))
+        ] + [sprite.rect for sprite in self.collision_sprites]
+
         if (
-            floor_rect_right.collidelist(self.collision_rects) < 0
+            floor_rect_right.collidelist(collision_rects) < 0
             and self.direction > 0
-            or floor_rect_left.collidelist(self.collision_rects) < 0
+            or floor_rect_left.collidelist(collision_rects) < 0
             and self.direction < 0
-            or wall_rect.collidelist(self.collision_rects) != -1
+            or wall_rect.collidelist(collision_rects) != -1
         ):
             self.direction *= -1
 
@@ -65,19 +78,13 @@ class Tooth(AnimatedSprite):
             self.direction *= -1
             self.reverse_timer.activate()
 
-    def update(self, dt: float) -> None:
-        self.reverse_timer.update()
+    def animate(self, dt: float) -> None:
+        self.frame_index += self.anim_speed * dt
+        frames = self.frames if self.direction > 0 else self.flipped_frames
+        self.image = frames[int(self.frame_index) % len(frames)]
 
+    def update(self, dt: float) -> None:
         super().update(dt)
-        if self.image is None:
-            raise TypeError("Sprite image is empty")
-
-        self.image = (
-            pygame.transform.flip(self.image, True, False)
-            if self.direction < 0
-            else self.image
-        )
-
         self.move(dt)
         self.collision()
 
@@ -90,23 +97,20 @@ class Shell(StateAnimatedSprite):
         reverse: bool,
         player: Player,
         create_pearl: Callable[[tuple[float, float], int], None],
+        scheduler: Scheduler,
         *groups: Group,
     ) -> None:
         super().__init__(pos, "idle", frames, *groups)
 
         if reverse:
-            self.frames = {}
-            for key, surfs in frames.items():
-                self.frames[key] = [
-                    pygame.transform.flip(surf, True, False) for surf in surfs
-                ]
+            self.frames = AssetManager.mirrored_states(frames)
             self.bullet_direction = -1
         else:
             self.frames = frames
             self.bullet_direction = 1
 
         self.player = player
-        self.shoot_timer = Timer(3000)
+        self.shoot_timer = Timer(3000, scheduler=scheduler)
         self.has_fired = False
         self.create_pearl = create_pearl
 
@@ -159,10 +163,6 @@ class Shell(StateAnimatedSprite):
                 self.state = "idle"
                 self.has_fired = False
 
-    def update(self, dt: float) -> None:
-        self.shoot_timer.update()
-        super().update(dt)
-
 
 class Pearl(Sprite):
     def __init__(
@@ -171,6 +171,7 @@ class Pearl(Sprite):
         surf: Surface,
         direction: int,
         speed: float,
+        scheduler: Scheduler,
         *groups: Group,
     ) -> None:
         self.pearl = True
@@ -185,8 +186,8 @@ class Pearl(Sprite):
         self.speed = speed
 
         self.timers = {
-            "lifetime": Timer(5000, self.kill),
-            "reverse": Timer(250),
+            "lifetime": Timer(5000, self.kill, scheduler=scheduler),
+            "reverse": Timer(250, scheduler=scheduler),
         }
         self.timers["lifetime"].activate()
 
@@ -201,10 +202,5 @@ class Pearl(Sprite):
             self.direction *= -1
             self.timers["reverse"].activate()
 
-    def update_timers(self) -> None:
-        for timer in self.timers.values():
-            timer.update()
-
     def update(self, dt: float) -> None:
-        self.update_timers()
         self.move(dt)
@@ -1,12 +1,30 @@
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
+from itertools import count
+from math import ceil, floor
 from random import choice, randint
 
 import pygame
 
 from savematter.sprites.objects import Cloud
-from savematter.sprites.sprites import Sprite
+from savematter.sprites.overworld import Node, WalkPath
+from savematter.sprites.spatial import SpatialHash
+from savematter.sprites.sprites import (
+    Sprite,
+    SyncedSprite,
+    TileChunk,
+    WaterRegion,
+    has_update,
+)
+from savematter.utils import backend
+from savematter.utils.assets import AssetManager
 from savematter.utils.settings import (
+    BATCH_BLITS,
+    DIRTY_RECT_LIMIT,
+    DIRTY_RECTS,
+    INTERPOLATE,
+    SCROLL_REUSE,
     TILE_SIZE,
     WINDOW_H,
     WINDOW_W,
@@ -16,62 +34,281 @@ from savematter.utils.timer import Timer
 from savematter.utils.typing import TYPE_CHECKING, Vector2, cast
 
 if TYPE_CHECKING:
-    from pygame import Surface
+    from collections.abc import Iterator
+
+    from pygame import Rect, Surface
 
     from savematter.game.data import Data
+    from savematter.utils.backend import Screen
+    from savematter.utils.timer import Scheduler
     from savematter.utils.typing import FrameList
 
+# Room for the horizon line at either edge of the sky band
+SKY_MARGIN = 4
+
+
+def rect_centery(sprite: Sprite) -> float:
+    if sprite.rect is None:
+        raise TypeError("Sprite rect is empty")
+
+    return sprite.rect.centery
+
+
+class LayeredGroup(pygame.sprite.Group, ABC):
+    """
+    Group that keeps its members in persistent per-z render buckets.
+
+    Sprites join their groups before the subclass has placed their rect, so
+    new members are filed on the next refresh instead of on add. Only the
+    dynamic members, the ones overriding update, are ticked by update().
+
+    With DIRTY_RECTS on, draw_camera also records the screen rects of the
+    members that can change between frames, see dirty_rects().
+
+    With INTERPOLATE on, update() remembers where the dynamic members were
+    before the step, and draw_camera places them between that and where they
+    are now, see interpolate().
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.pending: dict[Sprite, None] = {}
+        self.filed: dict[Sprite, int] = {}
+        self.dynamic: dict[Sprite, None] = {}
+        self.update_count = 0  # Sprites ticked since the last draw
+        self.frame_updates = 0  # Sprites ticked for the last drawn frame
+
+        # Dirty rects
+        self.offset = Vector2()
+        self.last_offset: Vector2 | None = None
+        self.scrolled = True
+        self.dirty: list[Rect] = []
+        self.last_dirty: list[Rect] = []
+
+        # Blits queued for one fblits call, reused every frame
+        self.batch: list[tuple[Surface, tuple[float, float]]] = []
+
+        # Interpolation, rect positions before the last update
+        self.previous: dict[Sprite, tuple[float, float]] = {}
+        self.alpha = 1.0
+
+    def add_internal(self, sprite: Sprite, layer: int | None = None) -> None:
+        super().add_internal(sprite, layer)
+        self.pending[sprite] = None
+        if has_update(sprite):
+            self.dynamic[sprite] = None
+
+    def remove_internal(self, sprite: Sprite) -> None:
+        super().remove_internal(sprite)
+        self.pending.pop(sprite, None)
+        self.dynamic.pop(sprite, None)
+        z = self.filed.pop(sprite, None)
+        if z is not None:
+            self.unfile(sprite, z)
+
+    def file_pending(self) -> None:
+        for sprite in self.pending:
+            self.filed[sprite] = sprite.z
+            self.file(sprite, sprite.z)
+        self.pending.clear()
+
+    def update(self, *args, **kwargs) -> None:
+        # Snapshot, sprites can spawn or kill others while updating
+        sprites = list(self.dynamic)
+        if INTERPOLATE:
+            self.previous = {}
+            for sprite in sprites:
+                if sprite.rect is None:
+                    raise TypeError("Sprite rect is empty")
+
+                self.previous[sprite] = sprite.rect.topleft
+        for sprite in sprites:
+            sprite.update(*args, **kwargs)
+        self.update_count += len(sprites)
+
+    def interpolate(self, sprite: Sprite, alpha: float) -> tuple[float, float]:
+        """
+        A sprite's rect position part way through the last update.
+
+        Args:
+            sprite: A member of the group.
+            alpha: 0 for where it was before the update, 1 for where it is.
+        """
+        if sprite.rect is None:
+            raise TypeError("Sprite rect is empty")
+
+        x, y = sprite.rect.topleft
+        previous = self.previous.get(sprite)
+        if previous is None or alpha == 1:
+            return x, y
+
+        px, py = previous
+        return px + (x - px) * alpha, py + (y - py) * alpha
+
+    def draw_pos(
+        self, sprite: Sprite, offset_x: float, offset_y: float
+    ) -> tuple[float, float]:
+        x, y = self.interpolate(sprite, self.alpha)
+        return x + offset_x, y + offset_y
 
-class WorldSprites(pygame.sprite.Group):
+    def draw_sprite(
+        self, surface: Screen | Surface, sprite: Sprite, pos: tuple[float, float]
+    ) -> None:
+        """Blit a sprite, or queue it for flush_batch() with BATCH_BLITS."""
+        if sprite.image is None:
+            raise TypeError("Sprite image is empty")
+
+        if BATCH_BLITS:
+            self.batch.append((sprite.image, pos))
+            if DIRTY_RECTS and self.is_dirty(sprite):
+                area = pygame.Rect(pos, sprite.image.get_size())
+                self.dirty.append(area.clip(surface.get_clip()))
+        else:
+            rect = surface.blit(sprite.image, pos)
+            if DIRTY_RECTS and self.is_dirty(sprite):
+                self.dirty.append(rect)
+
+    def flush_batch(self, surface: Screen | Surface) -> None:
+        """Submit the queued blits, in order, with a single call."""
+        if self.batch:
+            surface.fblits(self.batch)
+            self.batch.clear()
+
+    def begin_dirty_frame(self) -> None:
+        """Start collecting rects, call once the frame's offset is known."""
+        self.scrolled = self.offset != self.last_offset
+        self.last_offset = self.offset.copy()
+        self.last_dirty, self.dirty = self.dirty, []
+
+    def is_dirty(self, sprite: Sprite) -> bool:
+        """Whether a sprite can look different than it did last frame."""
+        if isinstance(sprite, SyncedSprite):
+            return sprite.clock.changed
+        return sprite in self.dynamic
+
+    def dirty_rects(self) -> list[Rect] | None:
+        """
+        Screen rects changed by the last draw_camera.
+
+        Returns:
+            The rects drawn this frame plus the ones drawn last frame, which
+            cover what moved or was killed since. None when the camera
+            scrolled or too much changed, meaning the whole screen is dirty.
+        """
+        if self.scrolled:
+            return None
+
+        rects = self.last_dirty + self.dirty
+        return rects if len(rects) <= DIRTY_RECT_LIMIT else None
+
+    @abstractmethod
+    def file(self, sprite: Sprite, z: int) -> None:
+        pass
+
+    @abstractmethod
+    def unfile(self, sprite: Sprite, z: int) -> None:
+        pass
+
+
+class WorldSprites(LayeredGroup):
     def __init__(self, data: Data) -> None:
         super().__init__()
-        self.screen: Surface | None = pygame.display.get_surface()
+        self.screen: Screen | None = backend.get_surface()
         self.data = data
-        self.offset = Vector2()
 
-    def draw_camera(self, target_pos: tuple[float, float]) -> None:
+        # Render buckets
+        self.layers: dict[int, dict[Sprite, None]] = {}
+        self.layer_keys: list[int] = []
+        self.main_layer: list[Sprite] = []
+
+    def file(self, sprite: Sprite, z: int) -> None:
+        if z == ZLayers.MAIN:
+            self.main_layer.append(sprite)
+        else:
+            if z not in self.layers:
+                self.layers[z] = {}
+                self.layer_keys = sorted(self.layers)
+            self.layers[z][sprite] = None
+
+    def unfile(self, sprite: Sprite, z: int) -> None:
+        if z == ZLayers.MAIN:
+            self.main_layer.remove(sprite)
+        else:
+            del self.layers[z][sprite]
+
+    def sort_main_layer(self) -> None:
+        # Insertion sort, linear while the bucket is still nearly sorted
+        layer = self.main_layer
+        for idx in range(1, len(layer)):
+            sprite = layer[idx]
+            centery = rect_centery(sprite)
+            prev = idx - 1
+            while prev >= 0 and rect_centery(layer[prev]) > centery:
+                layer[prev + 1] = layer[prev]
+                prev -= 1
+            layer[prev + 1] = sprite
+
+    def draw_camera(self, target_pos: tuple[float, float], alpha: float = 1) -> None:
         if self.screen is None:
             raise TypeError("Display surface is empty")
 
+        self.alpha = alpha
         self.offset.x = -(target_pos[0] - WINDOW_W / 2)
         self.offset.y = -(target_pos[1] - WINDOW_H / 2)
+        self.file_pending()
+        self.begin_dirty_frame()
+        self.frame_updates, self.update_count = self.update_count, 0
+        offset_x, offset_y = self.offset
 
         # Background
-        for sprite in sorted(self, key=lambda sprite: sprite.z):
-            if sprite.rect is None or sprite.image is None:
-                raise TypeError("Sprite rect or image are empty")
+        for z in self.layer_keys:
+            if z > ZLayers.MAIN:
+                break
+
+            for sprite in self.layers[z]:
+                if sprite.rect is None or sprite.image is None:
+                    raise TypeError("Sprite rect or image are empty")
 
-            if sprite.z < ZLayers.MAIN:
-                if sprite.z == ZLayers.PATH and sprite.level > self.data.unlocked_level:
-                    pass
+                if (
+                    isinstance(sprite, (Node, WalkPath))
+                    and sprite.level > self.data.unlocked_level
+                ):
+                    continue
+
+                if isinstance(sprite, WaterRegion):
+                    self.flush_batch(self.screen)
+                    rect = sprite.draw(self.screen, self.offset)
+                    if DIRTY_RECTS and self.is_dirty(sprite):
+                        self.dirty.append(rect)
                 else:
-                    offset_pos = sprite.rect.topleft + self.offset
-                    self.screen.blit(sprite.image, offset_pos)
+                    pos = self.draw_pos(sprite, offset_x, offset_y)
+                    self.draw_sprite(self.screen, sprite, pos)
 
         # Main
-        for sprite in sorted(self, key=lambda sprite: sprite.rect.centery):
+        self.sort_main_layer()
+        for sprite in self.main_layer:
             if sprite.rect is None or sprite.image is None:
                 raise TypeError("Sprite rect or image are empty")
 
-            if sprite.z == ZLayers.MAIN:
-                icon_offset = Vector2(0, -28) if hasattr(sprite, "icon") else Vector2()
-                offset_pos = sprite.rect.topleft + self.offset + icon_offset
-                self.screen.blit(sprite.image, offset_pos)
+            icon_offset = -28 if hasattr(sprite, "icon") else 0
+            pos = self.draw_pos(sprite, offset_x, offset_y + icon_offset)
+            self.draw_sprite(self.screen, sprite, pos)
+        self.flush_batch(self.screen)
 
 
-class AllSprites(pygame.sprite.Group):
+class AllSprites(LayeredGroup):
     def __init__(
         self,
         level_width: int,
         level_height: int,
         clouds: dict[str, Surface | FrameList],
+        scheduler: Scheduler,
         bg_tile: Surface | None = None,
         top_limit: int = 0,
         horizon_line: int = 0,
     ) -> None:
         super().__init__()
-        self.screen = pygame.display.get_surface()
-        self.offset = Vector2(0, 0)
+        self.screen = backend.get_surface()
         self.level_pwidth, self.level_pheight = (
             level_width * TILE_SIZE,
             level_height * TILE_SIZE,
@@ -85,12 +322,29 @@ class AllSprites(pygame.sprite.Group):
         self.draw_sky = not bg_tile
         self.horizon_line = horizon_line
 
+        # Render buckets, one spatial index per z layer
+        self.layers: dict[int, SpatialHash] = {}
+        self.layer_keys: list[int] = []
+        self.draw_order: dict[Sprite, int] = {}
+        self.order_counter = count()
+        self.camera_rect = pygame.FRect(0, 0, WINDOW_W, WINDOW_H)
+
+        # Scroll reuse, a composite of the background and the BG tile chunks,
+        # the part of a bg tile level's frame that never changes. Sky levels
+        # draw moving clouds under the chunks, so they have nothing to reuse.
+        self.scroll_reuse = (
+            SCROLL_REUSE
+            and not self.draw_sky
+            and isinstance(self.screen, pygame.Surface)
+        )
+        self.static_surf = pygame.Surface((WINDOW_W, WINDOW_H))
+        self.static_offset = Vector2()
+        self.static_valid = False
+
         if bg_tile:
-            for col in range(level_width):
-                for row in range(-int(top_limit / TILE_SIZE) - 1, level_height):
-                    x, y = col * TILE_SIZE, row * TILE_SIZE
-                    Sprite((x, y), bg_tile, self, z=-1)
+            self.bg_surf = self.create_background(bg_tile)
         else:  # Sky
+            self.sky_surf = self.create_sky()
             self.large_cloud = cast("Surface", clouds["large"])
             self.small_clouds = cast("FrameList", clouds["small"])
             self.cloud_direction = -1
@@ -101,7 +355,9 @@ class AllSprites(pygame.sprite.Group):
             self.large_cloud_tiles = int(self.level_pwidth / self.large_cloud.width) + 2
 
             # Small clouds
-            self.cloud_timer = Timer(2500, self.create_cloud, repeat=True)
+            self.cloud_timer = Timer(
+                2500, self.create_cloud, repeat=True, scheduler=scheduler
+            )
             self.cloud_timer.activate()
             for cloud in range(20):
                 pos = (
@@ -111,6 +367,99 @@ class AllSprites(pygame.sprite.Group):
                 surf = choice(self.small_clouds)
                 Cloud(pos, surf, self)
 
+    def add_internal(self, sprite: Sprite, layer: int | None = None) -> None:
+        super().add_internal(sprite, layer)
+        self.draw_order[sprite] = next(self.order_counter)
+
+    def remove_internal(self, sprite: Sprite) -> None:
+        super().remove_internal(sprite)
+        self.draw_order.pop(sprite, None)
+
+    def file(self, sprite: Sprite, z: int) -> None:
+        if sprite.rect is None:
+            raise TypeError("Sprite rect is empty")
+
+        if z not in self.layers:
+            self.layers[z] = SpatialHash()
+            self.layer_keys = sorted(self.layers)
+        self.layers[z].insert(sprite, sprite.rect)
+        if self.in_composite(sprite, z):
+            self.static_valid = False
+
+    def unfile(self, sprite: Sprite, z: int) -> None:
+        self.layers[z].remove(sprite)
+        if self.in_composite(sprite, z):
+            self.static_valid = False
+
+    def in_composite(self, sprite: Sprite, z: int) -> bool:
+        # The chunks are baked before anything else joins their layer, so
+        # drawing them first keeps the layer's order
+        return self.scroll_reuse and z == ZLayers.BG_TILES and type(sprite) is TileChunk
+
+    def refresh_index(self) -> None:
+        self.file_pending()
+
+        # Anything that overrides update may move
+        sprite: Sprite
+        for sprite in self.dynamic:
+            if sprite.rect is None:
+                raise TypeError("Sprite rect is empty")
+
+            self.layers[self.filed[sprite]].move(sprite, sprite.rect)
+
+    def visible_sprites(self) -> Iterator[Sprite]:
+        self.camera_rect.topleft = (-self.offset.x, -self.offset.y)
+        for z in self.layer_keys:
+            visible = cast("set[Sprite]", self.layers[z].query(self.camera_rect))
+            # Only the handful of on-screen sprites need their insertion order
+            for sprite in sorted(visible, key=self.draw_order.__getitem__):
+                if not self.in_composite(sprite, z):
+                    yield sprite
+
+    def redraw_static(self, area: Rect) -> None:
+        """Draw the composite within a screen area from scratch."""
+        surf = self.static_surf
+        surf.set_clip(area)
+        self.draw_background(surf)
+
+        world_area = area.move(-self.offset.x, -self.offset.y)
+        layer = self.layers.get(ZLayers.BG_TILES)
+        if layer is not None:
+            visible = cast("set[Sprite]", layer.query(world_area))
+            for sprite in sorted(visible, key=self.draw_order.__getitem__):
+                if self.in_composite(sprite, ZLayers.BG_TILES):
+                    pos = self.draw_pos(sprite, self.offset.x, self.offset.y)
+                    self.draw_sprite(surf, sprite, pos)
+            self.flush_batch(surf)
+        surf.set_clip(None)
+
+    def draw_static(self) -> None:
+        """
+        Blit the composite to the screen.
+
+        Last frame's composite is shifted by the camera delta with
+        Surface.scroll, so only the strips it exposes are drawn again.
+        """
+        if self.screen is None:
+            raise TypeError("Display surface is empty")
+
+        dx = int(self.offset.x - self.static_offset.x)
+        dy = int(self.offset.y - self.static_offset.y)
+        if not self.static_valid or abs(dx) >= WINDOW_W or abs(dy) >= WINDOW_H:
+            self.redraw_static(self.static_surf.get_rect())
+            self.static_valid = True
+        elif dx or dy:
+            self.static_surf.scroll(dx, dy)
+            if dx:
+                left = 0 if dx > 0 else WINDOW_W + dx
+                self.redraw_static(pygame.Rect(left, 0, abs(dx), WINDOW_H))
+            if dy:
+                top = 0 if dy > 0 else WINDOW_H + dy
+                self.redraw_static(pygame.Rect(0, top, WINDOW_W, abs(dy)))
+        self.static_offset.update(self.offset)
+
+        self.screen.blit(self.static_surf, (0, 0))
+
     def constrain_camera(self):
         self.offset.x = (
             self.offset.x
@@ -133,6 +482,71 @@ class AllSprites(pygame.sprite.Group):
             else self.borders["bottom"]
         )
 
+    def create_background(self, bg_tile: Surface) -> Surface:
+        """Tile bg_tile over the viewport plus one tile of scroll room."""
+        cols = ceil(WINDOW_W / TILE_SIZE) + 1
+        rows = ceil(WINDOW_H / TILE_SIZE) + 1
+        return AssetManager.tiled_pattern(bg_tile, cols, rows)
+
+    def draw_background(self, surf: Screen | Surface) -> None:
+        # The pattern repeats every tile, so only the offset's phase matters
+        surf.blit(
+            self.bg_surf,
+            (
+                self.offset.x % TILE_SIZE - TILE_SIZE,
+                self.offset.y % TILE_SIZE - TILE_SIZE,
+            ),
+        )
+
+    def create_sky(self) -> Surface:
+        """
+        Precompose the sky, horizon line and sea into one band.
+
+        The band is two screens tall with the horizon halfway, plus a margin
+        for the horizon line, so one blit covers any camera height where the
+        horizon is on screen.
+        """
+        horizon_pos = WINDOW_H + SKY_MARGIN
+        surf = pygame.Surface((WINDOW_W, horizon_pos * 2))
+        surf.fill("#ddc6a1")
+
+        # Horizon line
+        pygame.draw.line(
+            surf,
+            "#f5f1de",
+            (0, horizon_pos),
+            (WINDOW_W, horizon_pos),
+            4,
+        )
+
+        sea_rect = pygame.FRect(0, horizon_pos, WINDOW_W, horizon_pos)
+        pygame.draw.rect(surf, "#92a9ce", sea_rect)
+        return surf
+
+    def draw_sky_band(self, horizon_pos: float) -> None:
+        if self.screen is None:
+            raise TypeError("Display surface is empty")
+
+        # Past the margin the horizon line is off screen
+        if horizon_pos > WINDOW_H + SKY_MARGIN:
+            self.screen.fill("#ddc6a1")
+        elif horizon_pos < -SKY_MARGIN:
+            self.screen.fill("#92a9ce")
+        else:
+            self.screen.blit(self.sky_surf, (0, horizon_pos - WINDOW_H - SKY_MARGIN))
+
+    def update(self, dt: float) -> None:
+        super().update(dt)
+
+        if self.draw_sky:
+            # Large cloud
+            self.large_cloud_x += self.cloud_direction * self.large_cloud_speed * dt
+            self.large_cloud_x = (
+                0
+                if self.large_cloud_x <= -self.large_cloud.width
+                else self.large_cloud_x
+            )
+
     def create_cloud(self):
         pos = (
             randint(self.level_pwidth + 500, self.level_pwidth + 600),
@@ -141,50 +555,65 @@ class AllSprites(pygame.sprite.Group):
         surf = choice(self.small_clouds)
         Cloud(pos, surf, self)
 
-    def draw_camera(self, target_pos: tuple[float, float], dt: float) -> None:
+    def draw_camera(self, target_pos: tuple[float, float], alpha: float = 1) -> None:
         if self.screen is None:
             raise TypeError("Display surface is empty")
 
+        self.alpha = alpha
         self.offset.x = -(target_pos[0] - WINDOW_W / 2)
         self.offset.y = -(target_pos[1] - WINDOW_H / 2)
         self.constrain_camera()
+        # Whole pixels, so baked chunks and single sprites truncate the same way
+        self.offset.x, self.offset.y = floor(self.offset.x), floor(self.offset.y)
+        self.begin_dirty_frame()
+        self.frame_updates, self.update_count = self.update_count, 0
+        self.refresh_index()
 
         # Sky
         if self.draw_sky:
-            self.cloud_timer.update()
-            self.screen.fill("#ddc6a1")
-            horizon_pos = self.horizon_line + self.offset.y
-
-            # Horizon line
-            pygame.draw.line(
-                self.screen,
-                "#f5f1de",
-                (0, horizon_pos),
-                (WINDOW_W, horizon_pos),
-                4,
-            )
+            self.draw_sky_band(self.horizon_line + self.offset.y)
 
-            sea_rect = pygame.FRect(0, horizon_pos, WINDOW_W, WINDOW_H - horizon_pos)
-            pygame.draw.rect(self.screen, "#92a9ce", sea_rect)
-
-            # Large cloud
-            self.large_cloud_x += self.cloud_direction * self.large_cloud_speed * dt
-            self.large_cloud_x = (
-                0
-                if self.large_cloud_x <= -self.large_cloud.width
-                else self.large_cloud_x
+            # Large cloud, only the copies inside the viewport
+            strip_left = self.large_cloud_x + self.offset.x
+            first = max(floor(-strip_left / self.large_cloud.width), 0)
+            last = min(
+                floor((WINDOW_W - strip_left) / self.large_cloud.width),
+                self.large_cloud_tiles - 1,
             )
-            for cloud in range(self.large_cloud_tiles):
+            top = self.horizon_line - self.large_cloud.height + self.offset.y
+            for cloud in range(first, last + 1):
                 left = (
                     self.large_cloud_x + self.large_cloud.width * cloud + self.offset.x
                 )
-                top = self.horizon_line - self.large_cloud.height + self.offset.y
                 self.screen.blit(self.large_cloud, (left, top))
 
+            # The cloud band drifts every frame
+            if DIRTY_RECTS:
+                self.dirty.append(
+                    pygame.Rect(
+                        0,
+                        self.horizon_line - self.large_cloud.height + self.offset.y,
+                        WINDOW_W,
+                        self.large_cloud.height,
+                    )
+                )
+        elif self.scroll_reuse:
+            self.draw_static()
+        else:
+            self.draw_background(self.screen)
+
+        offset_x, offset_y = self.offset
         sprite: Sprite
-        for sprite in sorted(self, key=lambda sprite: sprite.z):
+        for sprite in self.visible_sprites():
             if sprite.rect is None or sprite.image is None:
                 raise TypeError("Sprite rect or image are empty")
 
-            offset_pos = sprite.rect.topleft + self.offset
-            self.screen.blit(sprite.image, offset_pos)
+            if isinstance(sprite, WaterRegion):
+                self.flush_batch(self.screen)
+                rect = sprite.draw(self.screen, self.offset)
+                if DIRTY_RECTS and self.is_dirty(sprite):
+                    self.dirty.append(rect)
+            else:
+                pos = self.draw_pos(sprite, offset_x, offset_y)
+                self.draw_sprite(self.screen, sprite, pos)
+        self.flush_batch(self.screen)
@@ -6,6 +6,7 @@ from random import randint
 import pygame
 
 from savematter.sprites.sprites import AnimatedSprite, Sprite
+from savematter.utils.assets import AssetManager
 from savematter.utils.settings import TILE_SIZE, ZLayers
 from savematter.utils.typing import TYPE_CHECKING
 
@@ -40,9 +41,14 @@ class Spike(Sprite):
         super().__init__(self.calc_pos(), surf, *groups, z=z)
 
     def calc_pos(self) -> tuple[float, float]:
-        # Trig
-        y = self.center[1] + self.radius * sin(radians(self.angle))
-        x = self.center[0] + self.radius * cos(radians(self.angle))
+        # Trig, once per frame for the ball and its whole chain
+        self.pivot = cos(radians(self.angle)), sin(radians(self.angle))
+        return self.point(self.radius)
+
+    def point(self, radius: float) -> tuple[float, float]:
+        """Position at a distance from the center along the current angle."""
+        x = self.center[0] + radius * self.pivot[0]
+        y = self.center[1] + radius * self.pivot[1]
         return x, y
 
     def update(self, dt: float) -> None:
@@ -59,6 +65,28 @@ class Spike(Sprite):
         self.rect.center = self.calc_pos()
 
 
+class SpikeChain(Sprite):
+    """Chain link placed along its Spike's angle, updated after the Spike."""
+
+    def __init__(
+        self,
+        spike: Spike,
+        surf: Surface,
+        radius: float,
+        *groups: Group,
+        z: int = ZLayers.BG_DETAILS,
+    ) -> None:
+        self.spike = spike
+        self.radius = radius
+        super().__init__(spike.point(radius), surf, *groups, z=z)
+
+    def update(self, dt: float) -> None:
+        if self.rect is None:
+            raise TypeError("Sprite rect is empty")
+
+        self.rect.center = self.spike.point(self.radius)
+
+
 class FloorSpike(AnimatedSprite):
     def __init__(
         self,
@@ -75,9 +103,7 @@ class FloorSpike(AnimatedSprite):
         self.hitbox.topleft = pos
 
         if inverted:
-            self.frames = [
-                pygame.transform.flip(frame, False, True) for frame in frames
-            ]
+            self.frames = AssetManager.mirrored_frames(frames, False, True)
         else:
             self.hitbox.move_ip(0, 32)
 
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from collections.abc import Hashable
+from math import floor
+
+import pygame
+
+from savematter.sprites.sprites import has_update
+from savematter.utils.settings import TILE_SIZE
+from savematter.utils.typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pygame import FRect, Rect
+    from pygame.sprite import Sprite
+
+Span = tuple[int, int, int, int]
+
+
+class SpatialHash:
+    """
+    Uniform grid of buckets keyed by cell coordinates.
+
+    Every item is stored in each cell its rect overlaps, so a query only has
+    to visit the cells covered by the query rect instead of every item.
+    """
+
+    def __init__(self, cell_size: int = TILE_SIZE) -> None:
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], set[Hashable]] = {}
+        self.spans: dict[Hashable, Span] = {}
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self.spans
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def span(self, rect: Rect | FRect) -> Span:
+        """Return the inclusive (left, top, right, bottom) cell range of a rect."""
+        size = self.cell_size
+        left, top = floor(rect.left / size), floor(rect.top / size)
+        right = max(left, floor((rect.right - 1) / size))
+        bottom = max(top, floor((rect.bottom - 1) / size))
+        return left, top, right, bottom
+
+    def insert(self, item: Hashable, rect: Rect | FRect) -> None:
+        if item in self.spans:
+            self.remove(item)
+
+        span = self.span(rect)
+        self.spans[item] = span
+        for cell in self._cells(span):
+            self.cells.setdefault(cell, set()).add(item)
+
+    def remove(self, item: Hashable) -> None:
+        span = self.spans.pop(item, None)
+        if span is None:
+            return
+
+        for cell in self._cells(span):
+            bucket = self.cells[cell]
+            bucket.discard(item)
+            if not bucket:
+                del self.cells[cell]
+
+    def move(self, item: Hashable, rect: Rect | FRect) -> None:
+        """Re-bucket an item, touching the cells only if its cell range changed."""
+        if self.spans.get(item) != self.span(rect):
+            self.insert(item, rect)
+
+    def query(self, rect: Rect | FRect) -> set[Hashable]:
+        """Return every item stored in the cells overlapped by a rect."""
+        found: set[Hashable] = set()
+        cells = self.cells
+        for cell in self._cells(self.span(rect)):
+            bucket = cells.get(cell)
+            if bucket:
+                found |= bucket
+        return found
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.spans.clear()
+
+    @staticmethod
+    def _cells(span: Span):
+        left, top, right, bottom = span
+        for x in range(left, right + 1):
+            for y in range(top, bottom + 1):
+                yield x, y
+
+
+def collide_rect(sprite: Sprite) -> Rect | FRect:
+    rect = sprite.hitbox if hasattr(sprite, "hitbox") else sprite.rect  # pyright: ignore[reportAttributeAccessIssue]
+    if rect is None:
+        raise TypeError("Sprite rect is empty")
+
+    return rect
+
+
+class SpatialGroup(pygame.sprite.Group):
+    """
+    Group whose members are registered in a SpatialHash broadphase.
+
+    Sprites join before their subclass has placed them, so they are filed on
+    the next refresh(), which also re-buckets the members that can move.
+    """
+
+    def __init__(self, cell_size: int = TILE_SIZE) -> None:
+        self.index = SpatialHash(cell_size)
+        self.pending: dict[Sprite, None] = {}
+        self.moving: dict[Sprite, None] = {}
+        super().__init__()
+
+    def add_internal(self, sprite: Sprite, layer: int | None = None) -> None:
+        super().add_internal(sprite, layer)
+        self.pending[sprite] = None
+
+    def remove_internal(self, sprite: Sprite) -> None:
+        super().remove_internal(sprite)
+        self.pending.pop(sprite, None)
+        self.moving.pop(sprite, None)
+        self.index.remove(sprite)
+
+    def refresh(self) -> None:
+        for sprite in self.pending:
+            self.index.insert(sprite, collide_rect(sprite))
+            if has_update(sprite):
+                self.moving[sprite] = None
+        self.pending.clear()
+
+        for sprite in self.moving:
+            self.index.move(sprite, collide_rect(sprite))
+
+    def query(self, rect: Rect | FRect) -> set[Sprite]:
+        """Broadphase: the members sharing a cell with a rect."""
+        return self.index.query(rect)  # pyright: ignore[reportReturnType]
+
+    def collide(self, rect: Rect | FRect) -> list[Sprite]:
+        """The members whose hitbox (or rect) overlaps a rect."""
+        return [
+            sprite
+            for sprite in self.query(rect)
+            if collide_rect(sprite).colliderect(rect)
+        ]
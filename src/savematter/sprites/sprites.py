@@ -1,20 +1,35 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from math import ceil, floor
 
 import pygame
 
-from savematter.utils.settings import ANIM_SPEED, TILE_SIZE, ZLayers
+from savematter.utils.assets import AssetManager
+from savematter.utils.settings import (
+    ANIM_SPEED,
+    CHUNK_SIZE,
+    TILE_SIZE,
+    WINDOW_H,
+    WINDOW_W,
+    ZLayers,
+)
 from savematter.utils.typing import TYPE_CHECKING, Vector2
 
 if TYPE_CHECKING:
-    from pygame import Surface
+    from pygame import FRect, Rect, Surface
     from pygame.sprite import Group
 
     from savematter.game.data import Data
+    from savematter.utils.backend import Screen
     from savematter.utils.typing import AnimationDict, FrameList
 
 
+def has_update(sprite: pygame.sprite.Sprite) -> bool:
+    """Whether a sprite overrides update, i.e. it can animate or move."""
+    return type(sprite).update is not pygame.sprite.Sprite.update
+
+
 class Sprite(pygame.sprite.Sprite):
     def __init__(
         self,
@@ -32,6 +47,47 @@ class Sprite(pygame.sprite.Sprite):
         self.z = z
 
 
+class TileChunk(Sprite):
+    def __init__(
+        self,
+        tiles: list[tuple[tuple[float, float], Surface]],
+        *groups: Group,
+        z: int = ZLayers.MAIN,
+    ) -> None:
+        # Bounding box of every tile, oversized tiles included
+        bounds = pygame.FRect(tiles[0][0], tiles[0][1].get_size()).unionall(
+            [pygame.FRect(pos, surf.get_size()) for pos, surf in tiles[1:]]
+        )
+
+        surf = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        surf.fblits(
+            [(tile, (pos[0] - bounds.x, pos[1] - bounds.y)) for pos, tile in tiles]
+        )
+        super().__init__(bounds.topleft, surf.convert_alpha(), *groups, z=z)
+
+
+def bake_tile_chunks(
+    tiles: list[tuple[tuple[float, float], Surface]],
+    *groups: Group,
+    z: int = ZLayers.MAIN,
+) -> list[TileChunk]:
+    """
+    Render static tiles into one surface per CHUNK_SIZE x CHUNK_SIZE block.
+
+    Args:
+        tiles: (position, surface) pairs, in the order they should be drawn.
+        *groups: The groups the chunk sprites join.
+        z: The z layer of every chunk.
+    """
+    chunk_px = CHUNK_SIZE * TILE_SIZE
+    chunks: dict[tuple[int, int], list[tuple[tuple[float, float], Surface]]] = {}
+    for pos, surf in tiles:
+        key = (int(pos[0] // chunk_px), int(pos[1] // chunk_px))
+        chunks.setdefault(key, []).append((pos, surf))
+
+    return [TileChunk(chunk, *groups, z=z) for chunk in chunks.values()]
+
+
 class AnimatedSprite(Sprite):
     def __init__(
         self,
@@ -53,6 +109,130 @@ class AnimatedSprite(Sprite):
         self.animate(dt)
 
 
+class AnimationClock:
+    def __init__(self, frames: FrameList, anim_speed: float) -> None:
+        self.frames, self.frame_index = frames, 0
+        self.anim_speed = anim_speed
+        self.image = self.frames[self.frame_index]
+        self.changed = False
+
+    def tick(self, dt: float) -> None:
+        self.frame_index += self.anim_speed * dt
+        image = self.frames[int(self.frame_index) % len(self.frames)]
+        # Latched, a frame can run several steps, see AnimationClocks.drawn()
+        self.changed |= image is not self.image
+        self.image = image
+
+
+class AnimationClocks:
+    """
+    One clock per (frames, speed) pair, shared by every SyncedSprite using it.
+
+    The owning scene ticks them once per simulation step and calls drawn()
+    after each frame, so looping decorations cost nothing per sprite.
+    """
+
+    def __init__(self) -> None:
+        self.clocks: dict[tuple[int, float], AnimationClock] = {}
+
+    def get(self, frames: FrameList, anim_speed: float = ANIM_SPEED) -> AnimationClock:
+        key = (id(frames), anim_speed)
+        if key not in self.clocks:
+            self.clocks[key] = AnimationClock(frames, anim_speed)
+        return self.clocks[key]
+
+    def update(self, dt: float) -> None:
+        for clock in self.clocks.values():
+            clock.tick(dt)
+
+    def drawn(self) -> None:
+        """Forget the frame changes once the scene has drawn them."""
+        for clock in self.clocks.values():
+            clock.changed = False
+
+
+class SyncedSprite(Sprite):
+    def __init__(
+        self,
+        pos: tuple[float, float],
+        clock: AnimationClock,
+        *groups: Group,
+        z: int = ZLayers.MAIN,
+    ) -> None:
+        self.clock = clock
+        super().__init__(pos, clock.image, *groups, z=z)
+
+    @property
+    def image(self) -> Surface:
+        return self.clock.image
+
+    @image.setter
+    def image(self, value: Surface) -> None:
+        # The current frame always comes from the clock
+        pass
+
+
+class WaterRegion(SyncedSprite):
+    """
+    Water area drawn from tile patterns instead of one sprite per tile.
+
+    The animated top row, or every row when there is no body tile, and the
+    still body are pre-tiled to the viewport plus one tile. A lake then costs
+    as much to draw as a pond, since only its visible part is blitted.
+    """
+
+    def __init__(
+        self,
+        rect: FRect,
+        clock: AnimationClock,
+        body: Surface | None,
+        *groups: Group,
+        z: int = ZLayers.WATER,
+    ) -> None:
+        super().__init__(rect.topleft, clock, *groups, z=z)
+        self.rect = rect.copy()
+
+        cols = ceil(WINDOW_W / TILE_SIZE) + 1
+        rows = ceil(WINDOW_H / TILE_SIZE) + 1
+        anim_rows = rows if body is None else 1
+        self.patterns = {
+            frame: AssetManager.tiled_pattern(frame, cols, anim_rows)
+            for frame in clock.frames
+        }
+        self.body = AssetManager.tiled_pattern(body, cols, rows) if body else None
+
+    def draw(self, surface: Screen, offset: Vector2) -> Rect:
+        """Blit the visible part of the region and return its animated area."""
+        if self.rect is None:
+            raise TypeError("Sprite rect is empty")
+
+        area = self.rect.move(offset)
+        if self.body is None:
+            return self.draw_pattern(surface, self.patterns[self.image], area)
+
+        top = pygame.FRect(area.topleft, (area.width, TILE_SIZE))
+        body = pygame.FRect(area.left, top.bottom, area.width, area.height - TILE_SIZE)
+        if body.height > 0:
+            self.draw_pattern(surface, self.body, body)
+        return self.draw_pattern(surface, self.patterns[self.image], top)
+
+    @staticmethod
+    def draw_pattern(surface: Screen, pattern: Surface, area: Rect | FRect) -> Rect:
+        """Tile a pattern over a screen area, clipped to the surface's clip."""
+        clip = surface.get_clip()
+        visible = clip.clip(area)
+        if not visible:
+            return visible
+
+        # Align the pattern with the area's tile grid
+        left = floor(visible.left - (visible.left - area.left) % TILE_SIZE)
+        top = floor(visible.top - (visible.top - area.top) % TILE_SIZE)
+        surface.set_clip(visible)
+        surface.blit(pattern, (left, top))
+        surface.set_clip(clip)
+        return visible
+
+
 class StateAnimatedSprite(AnimatedSprite, ABC):
     def __init__(
         self,
@@ -166,6 +346,10 @@ class MovingSprite(AnimatedSprite):
 
         self.flip = flip
         self.reverse = {"x": False, "y": False}
+        if flip:
+            self.flipped_frames = AssetManager.mirrored_frames(
+                frames, move_dir == "x", move_dir == "y"
+            )
 
     def check_border(self) -> None:
         if self.rect is None:
@@ -196,7 +380,12 @@ class MovingSprite(AnimatedSprite):
         self.rect.topleft += self.direction * self.speed * dt
         self.check_border()
         super().update(dt)
-        if self.flip:
-            self.image = pygame.transform.flip(
-                self.image, self.reverse["x"], self.reverse["y"]
-            )
+
+    def animate(self, dt: float) -> None:
+        self.frame_index += self.anim_speed * dt
+        frames = (
+            self.flipped_frames
+            if self.flip and self.reverse[self.move_dir]
+            else self.frames
+        )
+        self.image = frames[int(self.frame_index) % len(frames)]
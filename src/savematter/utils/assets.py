@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+from typing import ClassVar
+
+import pygame
+
+from savematter.utils.atlas import TextureAtlas
+from savematter.utils.settings import TILE_SIZE
 from savematter.utils.support import (
     import_anim_states,
     import_audio,
@@ -12,14 +18,21 @@ from savematter.utils.support import (
 from savematter.utils.typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pygame import Surface
     from pygame.font import Font
     from pygame.mixer import Sound
     from pytmx.pytmx import TiledMap
 
-    from savematter.utils.typing import SurfCollection
+    from savematter.utils.typing import AnimationDict, FrameList, SurfCollection
 
 
 class AssetManager:
+    # Derived frame sets, keyed by the id of their source collection. The source
+    # is kept alongside so its id can't be reused while the entry is alive.
+    _derived: ClassVar[dict[tuple, tuple[SurfCollection, SurfCollection]]] = {}
+
     def __init__(self) -> None:
         self.level_frames: dict[str, SurfCollection] = {}
         self.fonts: dict[str, Font] = {}
@@ -28,6 +41,7 @@ class AssetManager:
         self.audio_files: dict[str, Sound] = {}
         self.music_files: dict[str, Sound] = {}
         self.tmx_files: dict[str, dict[int, TiledMap]] = {}
+        self.atlas = TextureAtlas()
         self.load_assets()
 
     def load_assets(self) -> None:
@@ -75,6 +89,11 @@ class AssetManager:
             "icon": import_anim_states("graphics", "overworld", "icon"),
         }
 
+        # Atlas, same shapes but every image is a subsurface of a shared page
+        self.level_frames, self.ui_frames, self.overworld_frames = self.atlas.pack(
+            [self.level_frames, self.ui_frames, self.overworld_frames]
+        )
+
         self.audio_files = {
             "coin": import_audio("effects", "coin"),
             "attack": import_audio("effects", "attack"),
@@ -100,3 +119,122 @@ class AssetManager:
 
         self.tmx_files["maps"] = tmx_maps
         self.tmx_files["overworld"] = tmx_overworld
+
+    @classmethod
+    def _derive(
+        cls,
+        key: tuple,
+        source: SurfCollection,
+        build: Callable[[], SurfCollection],
+    ) -> SurfCollection:
+        if key not in cls._derived:
+            cls._derived[key] = (source, build())
+        return cls._derived[key][1]
+
+    @classmethod
+    def mirrored_frames(
+        cls, frames: FrameList, flip_x: bool = True, flip_y: bool = False
+    ) -> FrameList:
+        """
+        Get a mirrored copy of a frame list.
+
+        Built on first request and shared by every sprite using the same frames.
+
+        Args:
+            frames: The source frames.
+            flip_x: Mirror horizontally.
+            flip_y: Mirror vertically.
+        """
+        return cls._derive(  # pyright: ignore[reportReturnType]
+            ("mirror", id(frames), flip_x, flip_y),
+            frames,
+            lambda: [pygame.transform.flip(frame, flip_x, flip_y) for frame in frames],
+        )
+
+    @classmethod
+    def mirrored_states(
+        cls, frames: AnimationDict, flip_x: bool = True, flip_y: bool = False
+    ) -> AnimationDict:
+        """
+        Get a mirrored copy of every animation state.
+
+        Args:
+            frames: The source animation states.
+            flip_x: Mirror horizontally.
+            flip_y: Mirror vertically.
+        """
+        return cls._derive(  # pyright: ignore[reportReturnType]
+            ("mirror", id(frames), flip_x, flip_y),
+            frames,
+            lambda: {
+                state: cls.mirrored_frames(state_frames, flip_x, flip_y)
+                for state, state_frames in frames.items()
+            },
+        )
+
+    @classmethod
+    def silhouette_frames(cls, frames: FrameList) -> FrameList:
+        """
+        Get a white silhouette of every frame, transparent where the frame is.
+
+        Args:
+            frames: The source frames.
+        """
+
+        def build() -> FrameList:
+            silhouettes = []
+            for frame in frames:
+                surf = pygame.mask.from_surface(frame).to_surface()
+                surf.set_colorkey("black")
+                silhouettes.append(surf)
+            return silhouettes
+
+        return cls._derive(("silhouette", id(frames)), frames, build)  # pyright: ignore[reportReturnType]
+
+    @classmethod
+    def silhouette_states(cls, frames: AnimationDict) -> AnimationDict:
+        """
+        Get a white silhouette of every animation state.
+
+        Args:
+            frames: The source animation states.
+        """
+        return cls._derive(  # pyright: ignore[reportReturnType]
+            ("silhouette", id(frames)),
+            frames,
+            lambda: {
+                state: cls.silhouette_frames(state_frames)
+                for state, state_frames in frames.items()
+            },
+        )
+
+    @classmethod
+    def tiled_pattern(
+        cls, tile: Surface, cols: int, rows: int, step: int = TILE_SIZE
+    ) -> Surface:
+        """
+        Get a surface with a tile repeated over a grid.
+
+        Built on first request and shared by every renderer using the same tile.
+
+        Args:
+            tile: The source tile.
+            cols: Number of grid columns.
+            rows: Number of grid rows.
+            step: Grid spacing in pixels, larger tiles overlap the next cell.
+        """
+
+        def build() -> Surface:
+            surf = pygame.Surface((cols * step, rows * step), pygame.SRCALPHA)
+            surf.fblits(
+                [
+                    (tile, (col * step, row * step))
+                    for col in range(cols)
+                    for row in range(rows)
+                ]
+            )
+            return surf.convert_alpha()
+
+        return cls._derive(  # pyright: ignore[reportReturnType]
+            ("pattern", id(tile), cols, rows, step), tile, build
+        )
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import pygame
+
+from savematter.utils.settings import ATLAS_SIZE
+from savematter.utils.typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from pygame import Rect, Surface
+
+    from savematter.utils.typing import SurfCollection
+
+
+def _surfaces(collection: SurfCollection) -> Iterator[Surface]:
+    if isinstance(collection, dict):
+        for item in collection.values():
+            yield from _surfaces(item)
+    elif isinstance(collection, list):
+        yield from collection
+    else:
+        yield collection
+
+
+class TextureAtlas:
+    """
+    A few large pages that loaded images are packed into.
+
+    Images are placed on shelves, tallest first, and handed back as
+    subsurfaces of their page, so every draw of them reads from the same
+    handful of source surfaces.
+    """
+
+    def __init__(self, size: int = ATLAS_SIZE, padding: int = 1) -> None:
+        self.size = size
+        self.padding = padding
+        self.pages: list[Surface] = []
+
+    def pack(
+        self, collections: list[dict[str, SurfCollection]]
+    ) -> list[dict[str, SurfCollection]]:
+        """
+        Pack every image of some asset dicts into new pages.
+
+        Args:
+            collections: Asset dicts, as loaded by AssetManager.
+
+        Returns:
+            Copies of the dicts with the same shapes, every image replaced by
+            its subsurface in the atlas.
+        """
+        # An image shared between collections is only packed once
+        images: dict[int, Surface] = {}
+        for collection in collections:
+            for surf in _surfaces(collection):  # pyright: ignore[reportArgumentType]
+                images[id(surf)] = surf
+
+        placed = self.place(list(images.values()))
+        return [
+            {key: self.remap(item, placed) for key, item in collection.items()}
+            for collection in collections
+        ]
+
+    def place(self, images: list[Surface]) -> dict[int, Surface]:
+        """Shelf-pack images onto new pages, keyed by the id of the original."""
+        pad = self.padding
+        pages: list[list[tuple[Surface, Rect]]] = [[]]
+        x = y = shelf_height = 0
+        page_heights = [0]
+
+        for surf in sorted(images, key=lambda surf: surf.height, reverse=True):
+            width, height = surf.width + pad, surf.height + pad
+
+            # Too big for a page, give it one of its own
+            if width > self.size or height > self.size:
+                pages.insert(-1, [(surf, pygame.Rect((0, 0), surf.size))])
+                page_heights.insert(-1, surf.height)
+                continue
+
+            if x + width > self.size:
+                x, y, shelf_height = 0, y + shelf_height, 0
+            if y + height > self.size:
+                pages.append([])
+                page_heights.append(0)
+                x = y = shelf_height = 0
+
+            pages[-1].append((surf, pygame.Rect((x, y), surf.size)))
+            page_heights[-1] = max(page_heights[-1], y + height)
+            x += width
+            shelf_height = max(shelf_height, height)
+
+        placed: dict[int, Surface] = {}
+        for entries, page_height in zip(pages, page_heights):
+            if not entries:
+                continue
+
+            page_width = max(rect.right for _, rect in entries)
+            page = pygame.Surface((page_width, page_height), pygame.SRCALPHA)
+            page = page.convert_alpha()
+            page.fblits([(surf, rect) for surf, rect in entries])
+            self.pages.append(page)
+
+            for surf, rect in entries:
+                placed[id(surf)] = page.subsurface(rect)
+        return placed
+
+    def remap(
+        self, collection: SurfCollection, placed: dict[int, Surface]
+    ) -> SurfCollection:
+        if isinstance(collection, dict):
+            return {
+                key: self.remap(item, placed)  # pyright: ignore[reportReturnType]
+                for key, item in collection.items()
+            }
+        if isinstance(collection, list):
+            return [placed[id(surf)] for surf in collection]
+        return placed[id(collection)]
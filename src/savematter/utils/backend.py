@@ -0,0 +1,350 @@
+"""
+Render backends.
+
+The default backend draws onto the pygame.display surface. The texture
+backend draws through a pygame._sdl2 Renderer instead, behind a TextureScreen
+that mirrors the part of the Surface API the game draws with. Scenes and
+groups only ever talk to whatever get_surface() returns, the UI to
+get_display().
+
+On the Surface backend the scene can also be drawn at a fraction of the
+window resolution by a ScaledScreen, then upscaled once per frame before the
+UI draws on top at full resolution.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from math import floor
+from weakref import WeakKeyDictionary
+
+import pygame
+from pygame._sdl2.video import Renderer, Texture, Window
+
+from savematter.utils.settings import FRAME_BUDGET, RENDER_SCALES
+from savematter.utils.typing import TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from pygame import Rect, Surface
+    from pygame.typing import ColorLike, Point, RectLike
+
+
+def blit_pos(dest: Point | RectLike) -> tuple[int, int]:
+    """Where a blit to dest lands, Surface blits truncate the position."""
+    if isinstance(dest, (pygame.Rect, pygame.FRect)):
+        return int(dest.x), int(dest.y)
+
+    # A point, or a rect as (x, y, w, h)
+    pos = cast("Sequence[float]", dest)
+    return int(pos[0]), int(pos[1])
+
+
+class TextureScreen:
+    """
+    Renderer-backed stand-in for the display surface.
+
+    Images are uploaded as textures the first time they are drawn and kept
+    for as long as the Surface lives. Subsurfaces, like the atlas frames, draw
+    a region of their parent's texture, so a whole atlas page is one upload.
+    """
+
+    def __init__(self, size: tuple[int, int], title: str) -> None:
+        self.window = Window(title, size)
+        self.renderer = Renderer(self.window)
+        self.rect = pygame.Rect((0, 0), size)
+        self.clip = self.rect.copy()
+        self.textures: WeakKeyDictionary[Surface, Texture] = WeakKeyDictionary()
+
+    def get_size(self) -> tuple[int, int]:
+        return self.rect.size
+
+    def get_rect(self) -> Rect:
+        return self.rect.copy()
+
+    def get_clip(self) -> Rect:
+        return self.clip.copy()
+
+    def set_clip(self, rect: RectLike | None) -> None:
+        self.clip = self.rect.clip(rect) if rect is not None else self.rect.copy()
+
+    def texture(self, surf: Surface) -> tuple[Texture, Rect]:
+        """The texture holding a surface and the surface's area inside it."""
+        parent = surf.get_abs_parent()
+        if parent not in self.textures:
+            self.textures[parent] = Texture.from_surface(self.renderer, parent)
+        return self.textures[parent], pygame.Rect(surf.get_abs_offset(), surf.size)
+
+    def fill(self, color: ColorLike, rect: RectLike | None = None) -> Rect:
+        area = self.clip.clip(rect) if rect is not None else self.clip
+        self.renderer.draw_color = pygame.Color(color)
+        self.renderer.fill_rect(area)
+        return area
+
+    def blit(
+        self,
+        source: Surface,
+        dest: Point | RectLike,
+        area: RectLike | None = None,
+        special_flags: int = 0,
+    ) -> Rect:
+        texture, src = self.texture(source)
+        if area is not None:
+            src = src.clip(pygame.Rect(area).move(src.topleft))
+
+        # Surface blits clip to the clip rect
+        dst = pygame.Rect(blit_pos(dest), src.size)
+        visible = dst.clip(self.clip)
+        if visible:
+            src = pygame.Rect(
+                src.x + visible.x - dst.x,
+                src.y + visible.y - dst.y,
+                visible.width,
+                visible.height,
+            )
+            texture.draw(srcrect=src, dstrect=visible)
+        return visible
+
+    def blits(
+        self,
+        blit_sequence: Iterable[Sequence],
+        doreturn: bool = True,
+    ) -> list[Rect] | None:
+        rects = [self.blit(*blit) for blit in blit_sequence]
+        return rects if doreturn else None
+
+    def fblits(self, blit_sequence: Iterable[tuple[Surface, Point]]) -> None:
+        for source, dest in blit_sequence:
+            self.blit(source, dest)
+
+    def present(self) -> None:
+        self.renderer.present()
+        self.renderer.draw_color = pygame.Color("black")
+        self.renderer.clear()
+
+
+class ScaledScreen:
+    """
+    Scene target that renders at a fraction of the window resolution.
+
+    The game keeps drawing in window coordinates. Every image is drawn from a
+    copy scaled once and kept for as long as the Surface lives, so the scene
+    covers the same view with fewer pixels. upscale() stretches the result
+    over the display surface.
+    """
+
+    def __init__(self, display: Surface, scale: float = 1.0) -> None:
+        self.display = display
+        self.rect = display.get_rect()
+        self.clip = self.rect.copy()
+        self.set_scale(scale)
+
+    def set_scale(self, scale: float) -> None:
+        self.scale = scale
+        self.scaled: WeakKeyDictionary[Surface, Surface] = WeakKeyDictionary()
+        if scale == 1:
+            self.surface = self.display
+        else:
+            self.surface = pygame.Surface(self.scale_rect(self.rect).size).convert()
+        self.surface.set_clip(self.scale_rect(self.clip))
+
+    def scale_rect(self, rect: RectLike) -> Rect:
+        # Scaling both edges keeps neighbouring rects seamless
+        rect, scale = pygame.Rect(rect), self.scale
+        left, top = floor(rect.left * scale), floor(rect.top * scale)
+        right, bottom = floor(rect.right * scale), floor(rect.bottom * scale)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def scale_point(self, dest: Point | RectLike) -> tuple[int, int]:
+        x, y = blit_pos(dest)
+        return floor(x * self.scale), floor(y * self.scale)
+
+    def image(self, surf: Surface) -> Surface:
+        """A surface scaled to the render resolution."""
+        if self.scale == 1:
+            return surf
+        if surf not in self.scaled:
+            size = round(surf.width * self.scale), round(surf.height * self.scale)
+            self.scaled[surf] = pygame.transform.scale(surf, size)
+        return self.scaled[surf]
+
+    def get_size(self) -> tuple[int, int]:
+        return self.rect.size
+
+    def get_rect(self) -> Rect:
+        return self.rect.copy()
+
+    def get_clip(self) -> Rect:
+        return self.clip.copy()
+
+    def set_clip(self, rect: RectLike | None) -> None:
+        self.clip = self.rect.clip(rect) if rect is not None else self.rect.copy()
+        self.surface.set_clip(self.scale_rect(self.clip))
+
+    def fill(self, color: ColorLike, rect: RectLike | None = None) -> Rect:
+        area = self.clip.clip(rect) if rect is not None else self.clip
+        self.surface.fill(color, self.scale_rect(area))
+        return area
+
+    def blit(
+        self,
+        source: Surface,
+        dest: Point | RectLike,
+        area: RectLike | None = None,
+        special_flags: int = 0,
+    ) -> Rect:
+        size = source.size
+        if area is not None:
+            area = pygame.Rect(area).clip(source.get_rect())
+            size = area.size
+            area = self.scale_rect(area)
+
+        pos = self.scale_point(dest)
+        self.surface.blit(self.image(source), pos, area, special_flags)
+        return pygame.Rect(blit_pos(dest), size).clip(self.clip)
+
+    def blits(
+        self,
+        blit_sequence: Iterable[Sequence],
+        doreturn: bool = True,
+    ) -> list[Rect] | None:
+        rects = [self.blit(*blit) for blit in blit_sequence]
+        return rects if doreturn else None
+
+    def fblits(self, blit_sequence: Iterable[tuple[Surface, Point]]) -> None:
+        self.surface.fblits(
+            [
+                (self.image(source), self.scale_point(dest))
+                for source, dest in blit_sequence
+            ]
+        )
+
+    def upscale(self) -> None:
+        if self.surface is not self.display:
+            pygame.transform.scale(self.surface, self.rect.size, self.display)
+
+
+class DynamicResolution:
+    """
+    Moves a ScaledScreen along RENDER_SCALES to keep frames within a budget.
+
+    The average frame time over a window of frames is compared to the budget,
+    dropping a step while over it and climbing back once there is plenty of
+    headroom, so the scale does not flip back and forth every window.
+    """
+
+    def __init__(
+        self,
+        screen: ScaledScreen,
+        budget: float = FRAME_BUDGET,
+        window: int = 30,
+        headroom: float = 0.6,
+    ) -> None:
+        self.screen = screen
+        self.budget = budget
+        self.headroom = headroom
+        self.frame_times: deque[float] = deque(maxlen=window)
+        self.step = min(
+            range(len(RENDER_SCALES)),
+            key=lambda step: abs(RENDER_SCALES[step] - screen.scale),
+        )
+
+    def update(self, dt: float) -> None:
+        self.frame_times.append(dt)
+        if len(self.frame_times) < (self.frame_times.maxlen or 0):
+            return
+
+        average = sum(self.frame_times) / len(self.frame_times)
+        if average > self.budget and self.step < len(RENDER_SCALES) - 1:
+            self.step += 1
+        elif average < self.budget * self.headroom and self.step > 0:
+            self.step -= 1
+        else:
+            return
+
+        logging.debug(
+            f"Render scale {RENDER_SCALES[self.step]}, {average * 1000:.1f} ms"
+        )
+        self.screen.set_scale(RENDER_SCALES[self.step])
+        self.frame_times.clear()
+
+
+if TYPE_CHECKING:
+    Screen = Surface | TextureScreen | ScaledScreen
+
+_screen: Surface | TextureScreen | None = None
+_scene: Screen | None = None
+
+
+def set_mode(
+    size: tuple[int, int],
+    title: str,
+    backend: str = "surface",
+    scale: float = 1.0,
+    dynamic: bool = False,
+) -> Screen:
+    """
+    Open the game window.
+
+    Args:
+        size: Window size.
+        title: Window caption.
+        backend: "surface" to draw on the display surface, "texture" to draw
+                 through a pygame._sdl2 Renderer.
+        scale: Scene resolution as a fraction of the window, Surface backend
+               only since the renderer already scales on the GPU.
+        dynamic: Let a DynamicResolution adjust the scale, see get_resolution().
+
+    Returns:
+        The scene surface, see get_surface().
+    """
+    global _screen, _scene
+    match backend:
+        case "surface":
+            _screen = _scene = pygame.display.set_mode(size)
+            pygame.display.set_caption(title)
+            if scale != 1 or dynamic:
+                _scene = ScaledScreen(_screen, scale)
+        case "texture":
+            # Surface.convert needs a video mode for its pixel format
+            pygame.display.set_mode((1, 1), pygame.HIDDEN)
+            _screen = _scene = TextureScreen(size, title)
+        case _:
+            raise ValueError(f"Unknown render backend: {backend}")
+    return _scene
+
+
+def get_surface() -> Screen | None:
+    """The surface scenes draw to, like pygame.display.get_surface()."""
+    return _scene
+
+
+def get_display() -> Surface | TextureScreen | None:
+    """The full resolution surface the UI draws to after upscale()."""
+    return _screen
+
+
+def get_resolution() -> DynamicResolution | None:
+    """A controller for the scene resolution, if it can be scaled."""
+    if isinstance(_scene, ScaledScreen):
+        return DynamicResolution(_scene)
+    return None
+
+
+def upscale() -> None:
+    """Stretch the scene over the display, a no-op at full resolution."""
+    if isinstance(_scene, ScaledScreen):
+        _scene.upscale()
+
+
+def update(rects: Sequence[Rect] | None = None) -> None:
+    """Present the frame, only the given rects on the Surface backend."""
+    if isinstance(_screen, TextureScreen):
+        _screen.present()
+    elif rects is None or isinstance(_scene, ScaledScreen):
+        # Scaled images can spill a pixel past the rects they report
+        pygame.display.update()
+    else:
+        pygame.display.update(rects)
@@ -0,0 +1,114 @@
+"""
+Frame pacing.
+
+pygame's Clock.tick only sleeps with SDL_Delay, which can overshoot by a
+millisecond or more, and with a target of 0 it does not sleep at all, so the
+game used every cycle it could get even on the static overworld. FramePacer
+aims for the display refresh rate instead, sleeping through most of what is
+left of each frame and spinning only for the last stretch, where the sleep
+could overshoot.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+
+import pygame
+
+from savematter.utils.settings import FPS, IDLE_FPS
+
+
+class FramePacer:
+    """
+    Ends each frame on a deadline derived from a target rate.
+
+    The deadline advances by whole frame periods rather than from whenever
+    tick() was called, so late frames do not push every later one back. A
+    frame that misses its deadline by more than a period restarts the
+    schedule from now instead of rushing to catch up.
+    """
+
+    def __init__(
+        self,
+        fps: int = FPS,
+        idle_fps: int = IDLE_FPS,
+        spin: float = 0.002,
+        window: int = 120,
+    ) -> None:
+        # 0 means the display refresh rate, which SDL reports as 0 if unknown
+        self.fps = fps or pygame.display.get_current_refresh_rate() or 60
+        self.idle_fps = min(idle_fps, self.fps) if idle_fps else self.fps
+        self.spin = spin
+        self.frame_times: deque[float] = deque(maxlen=window)
+        self.work_times: deque[float] = deque(maxlen=window)
+        self.last = time.perf_counter()
+        self.work = 0.0
+        self.deadline = self.last
+        self.missed = 0
+        logging.debug(f"Frame pacing at {self.fps} fps, {self.idle_fps} fps idle")
+
+    def tick(self, idle: bool = False) -> float:
+        """
+        Wait until the frame is due.
+
+        Args:
+            idle: Pace at the idle rate, for frames where nothing is moving.
+
+        Returns:
+            The time since the last tick in seconds, like Clock.tick() / 1000.
+        """
+        period = 1 / (self.idle_fps if idle else self.fps)
+        self.deadline += period
+
+        # Time spent on the frame itself, without the wait
+        self.work = time.perf_counter() - self.last
+        self.work_times.append(self.work)
+
+        remaining = self.deadline - time.perf_counter()
+        if remaining > self.spin:
+            time.sleep(remaining - self.spin)
+        while time.perf_counter() < self.deadline:
+            pass
+
+        now = time.perf_counter()
+        if now - self.deadline > period:
+            self.missed += 1
+            self.deadline = now
+
+        dt = now - self.last
+        self.last = now
+        self.frame_times.append(dt)
+        return dt
+
+    def stats(self) -> dict[str, float]:
+        """
+        Measured frame times over the last window of frames.
+
+        Returns:
+            The average, 99th percentile and worst frame time in milliseconds,
+            the average time spent working rather than waiting, the average
+            rate in fps, and the frames that missed their deadline by more
+            than a period since the pacer started.
+        """
+        if not self.frame_times:
+            return {
+                "avg": 0,
+                "p99": 0,
+                "max": 0,
+                "work": 0,
+                "fps": 0,
+                "missed": self.missed,
+            }
+
+        times = sorted(self.frame_times)
+        average = sum(times) / len(times)
+        return {
+            "avg": average * 1000,
+            "p99": times[min(len(times) - 1, int(len(times) * 0.99))] * 1000,
+            "max": times[-1] * 1000,
+            "work": sum(self.work_times) / len(self.work_times) * 1000,
+            "fps": 1 / average if average else 0,
+            "missed": self.missed,
+        }
@@ -2,8 +2,25 @@ from enum import Enum, IntEnum, StrEnum, auto, unique
 
 WINDOW_W, WINDOW_H = 1280, 720
 TILE_SIZE = 64
+CHUNK_SIZE = 16  # In tiles
 ANIM_SPEED = 6
-FPS = 0
+FPS = 0  # 0 to match the display refresh rate
+IDLE_FPS = 30  # While nothing moves on the overworld, 0 to keep FPS
+FRAME_PACING = True  # Sleep out the frame budget, off for Clock.tick(FPS)
+SIM_RATE = 60  # Fixed simulation steps per second, 0 to step once per frame
+MAX_SIM_STEPS = 5  # Per frame, past this the simulation falls behind
+INTERPOLATE = True  # Draw between the last two simulation steps
+RENDER_BACKEND = "surface"  # Or "texture", see utils/backend.py
+RENDER_SCALE = 1.0  # Scene resolution as a fraction of the window
+DYNAMIC_RESOLUTION = False  # Adjust the scene resolution to the frame time
+RENDER_SCALES = (1.0, 0.75, 0.5)  # Steps keep TILE_SIZE * scale whole
+FRAME_BUDGET = 1 / 60  # In seconds
+DIRTY_RECTS = False  # Present only the changed screen regions
+DIRTY_RECT_LIMIT = 128  # Beyond this a full update is cheaper
+ATLAS_SIZE = 2048  # Texture atlas page size
+BATCH_BLITS = True  # Submit sprite blits with one fblits call per pass
+SCROLL_REUSE = False  # Scroll last frame's background instead of redrawing it
+DEBUG_OVERLAY = False  # Show how many sprites were updated for each frame
 
 
 # Layers
@@ -1,13 +1,64 @@
+"""
+Timers on simulation time.
+
+A Scheduler keeps its own clock, advanced by whoever owns it with the
+simulation step, and a heap of pending timers ordered by when they are due.
+Timers are pushed once when activated and popped when due, so an idle or
+waiting timer costs nothing per frame. Nothing reads the wall clock, so
+pausing is not advancing and fast forwarding is advancing by more, with
+timers firing in the same order either way.
+
+game_scheduler runs the game wide timers, like the UI's. Scenes own their
+own, so their timers go away with them.
+"""
+
 from __future__ import annotations
 
+import heapq
 from collections.abc import Callable
+from itertools import count
 from random import randint
 
-from pygame.time import get_ticks
-
 from savematter.utils.typing import cast
 
 
+class Scheduler:
+    def __init__(self) -> None:
+        self.time = 0.0  # In milliseconds, like Timer durations
+        self.paused = False
+        self.queue: list[tuple[float, int, int, Timer]] = []
+        self.order = count()  # Ties fire in the order they were scheduled
+
+    def schedule(self, timer: Timer, delay: float) -> None:
+        heapq.heappush(
+            self.queue, (self.time + delay, next(self.order), timer.generation, timer)
+        )
+
+    def advance(self, dt: float) -> None:
+        """
+        Move the clock forward and fire every timer due by then.
+
+        Args:
+            dt: Simulation time in seconds.
+        """
+        if self.paused:
+            return
+
+        end = self.time + dt * 1000
+        while self.queue and self.queue[0][0] <= end:
+            due, _, generation, timer = heapq.heappop(self.queue)
+            # Reactivated or deactivated since this entry was pushed
+            if generation != timer.generation:
+                continue
+            # Timers activated by a callback start from when it fired
+            self.time = due
+            timer.fire()
+        self.time = end
+
+
+game_scheduler = Scheduler()
+
+
 class Timer:
     def __init__(
         self,
@@ -16,6 +67,7 @@ class Timer:
         repeat: bool = False,
         random: bool = False,
         lower_bound: int | None = None,
+        scheduler: Scheduler | None = None,
     ) -> None:
         if random and lower_bound is None:
             raise TypeError("Lower bound can't be empty if duration is random")
@@ -24,23 +76,23 @@ class Timer:
             randint(cast("int", lower_bound), duration) if random else duration
         )
         self.func = func
-        self.start_time = 0
         self.active = False
         self.repeat = repeat
+        self.scheduler = scheduler or game_scheduler
+        self.generation = 0
 
     def activate(self) -> None:
         self.active = True
-        self.start_time = get_ticks()
+        self.generation += 1
+        self.scheduler.schedule(self, self.duration)
 
     def deactivate(self) -> None:
         self.active = False
-        self.start_time = 0
+        self.generation += 1
+
+    def fire(self) -> None:
+        self.deactivate()
+        if self.func:
+            self.func()
         if self.repeat:
             self.activate()
-
-    def update(self) -> None:
-        current_time = get_ticks()
-        if current_time - self.start_time >= self.duration:
-            if self.func and self.start_time != 0:
-                self.func()
-            self.deactivate()
@@ -0,0 +1,110 @@
+import pygame
+import pytest
+
+from savematter.sprites.collision import CollisionMap
+
+SIZE = 64
+
+
+@pytest.fixture
+def collision_map() -> CollisionMap:
+    # Solid everywhere, so any cell a query reaches shows up in the result
+    collision_map = CollisionMap(10, 5, SIZE, vertical_merge=False)
+    for y in range(collision_map.height):
+        for x in range(collision_map.width):
+            collision_map.add_tile(x, y)
+    collision_map.merge()
+    return collision_map
+
+
+@pytest.mark.parametrize(
+    "rect",
+    [
+        pygame.FRect(-3 * SIZE, SIZE, SIZE, SIZE),  # Left
+        pygame.FRect(SIZE, -3 * SIZE, SIZE, SIZE),  # Above
+        pygame.FRect(12 * SIZE, SIZE, SIZE, SIZE),  # Right
+        pygame.FRect(SIZE, 7 * SIZE, SIZE, SIZE),  # Below
+        pygame.FRect(-3 * SIZE, -3 * SIZE, SIZE, SIZE),  # Above left
+    ],
+)
+def test_query_off_map(collision_map: CollisionMap, rect: pygame.FRect) -> None:
+    assert collision_map.query(rect) == []
+    assert not collision_map.collides(rect)
+
+
+def test_query_on_edge(collision_map: CollisionMap) -> None:
+    # Overhanging the top left corner only reaches the first row
+    rect = pygame.FRect(-SIZE / 2, -SIZE / 2, SIZE, SIZE)
+    assert collision_map.query(rect) == [collision_map.grid[0][0]]
+
+
+def make_map(rows: list[str], vertical_merge: bool = True) -> CollisionMap:
+    collision_map = CollisionMap(len(rows[0]), len(rows), SIZE, vertical_merge)
+    for y, row in enumerate(rows):
+        for x, cell in enumerate(row):
+            if cell == "#":
+                collision_map.add_tile(x, y)
+    collision_map.merge()
+    return collision_map
+
+
+def covered_cells(collision_map: CollisionMap) -> list[tuple[int, int]]:
+    """Every cell under a collider, repeated if colliders overlap."""
+    cells = []
+    for collider in collision_map.colliders:
+        rect = collider.rect
+        for y in range(int(rect.top // SIZE), int(rect.bottom // SIZE)):
+            for x in range(int(rect.left // SIZE), int(rect.right // SIZE)):
+                cells.append((x, y))
+    return cells
+
+
+def solid_cells(rows: list[str]) -> list[tuple[int, int]]:
+    return [
+        (x, y)
+        for y, row in enumerate(rows)
+        for x, cell in enumerate(row)
+        if cell == "#"
+    ]
+
+
+def test_merge_l_shape() -> None:
+    rows = [
+        "#...",
+        "#...",
+        "####",
+    ]
+    collision_map = make_map(rows)
+    assert [collider.rect for collider in collision_map.colliders] == [
+        pygame.FRect(0, 0, SIZE, 3 * SIZE),
+        pygame.FRect(SIZE, 2 * SIZE, 3 * SIZE, SIZE),
+    ]
+    assert sorted(covered_cells(collision_map)) == sorted(solid_cells(rows))
+
+
+def test_merge_with_hole() -> None:
+    rows = [
+        "###",
+        "#.#",
+        "###",
+    ]
+    collision_map = make_map(rows)
+    assert [collider.rect for collider in collision_map.colliders] == [
+        pygame.FRect(0, 0, 3 * SIZE, SIZE),
+        pygame.FRect(0, SIZE, SIZE, 2 * SIZE),
+        pygame.FRect(2 * SIZE, SIZE, SIZE, 2 * SIZE),
+        pygame.FRect(SIZE, 2 * SIZE, SIZE, SIZE),
+    ]
+    assert sorted(covered_cells(collision_map)) == sorted(solid_cells(rows))
+    assert collision_map.grid[1][1] is None
+
+
+def test_merge_without_vertical_merge() -> None:
+    rows = [
+        "##..",
+        "##..",
+        "####",
+    ]
+    collision_map = make_map(rows, vertical_merge=False)
+    assert all(collider.rect.height == SIZE for collider in collision_map.colliders)
+    assert sorted(covered_cells(collision_map)) == sorted(solid_cells(rows))
@@ -0,0 +1,18 @@
+import pygame
+
+from savematter.sprites.sprites import AnimationClocks
+
+
+def test_clock_change_survives_steps() -> None:
+    frames = [pygame.Surface((1, 1)) for _ in range(2)]
+    clocks = AnimationClocks()
+    clock = clocks.get(frames, anim_speed=1)
+
+    # Two steps in one frame, the change happens in the first
+    clocks.update(1)
+    clocks.update(0.5)
+    assert clock.changed
+
+    clocks.drawn()
+    clocks.update(0.1)
+    assert not clock.changed
@@ -0,0 +1,65 @@
+from savematter.utils.timer import Scheduler, Timer
+
+
+def test_pause_does_not_advance() -> None:
+    scheduler = Scheduler()
+    fired = []
+    Timer(100, lambda: fired.append(True), scheduler=scheduler).activate()
+
+    scheduler.paused = True
+    scheduler.advance(1)
+    assert scheduler.time == 0
+    assert not fired
+
+    scheduler.paused = False
+    scheduler.advance(0.1)
+    assert fired
+
+
+def test_same_time_fires_in_schedule_order() -> None:
+    scheduler = Scheduler()
+    fired = []
+    for name in "abc":
+        Timer(100, lambda name=name: fired.append(name), scheduler=scheduler).activate()
+
+    scheduler.advance(0.1)
+    assert fired == ["a", "b", "c"]
+
+
+def repeat_times(steps: list[float]) -> list[float]:
+    scheduler = Scheduler()
+    fired = []
+    timer = Timer(
+        250, lambda: fired.append(scheduler.time), repeat=True, scheduler=scheduler
+    )
+    timer.activate()
+    for dt in steps:
+        scheduler.advance(dt)
+    assert timer.active
+    return fired
+
+
+def test_fast_forward_repeats() -> None:
+    # One large step fires on the same times as many small ones
+    assert repeat_times([1.1]) == [250, 500, 750, 1000]
+    assert repeat_times([1 / 60] * 66) == [250, 500, 750, 1000]
+
+
+def test_stale_entries_are_dropped() -> None:
+    scheduler = Scheduler()
+    fired = []
+    reactivated = Timer(100, lambda: fired.append("reactivated"), scheduler=scheduler)
+    deactivated = Timer(100, lambda: fired.append("deactivated"), scheduler=scheduler)
+    reactivated.activate()
+    deactivated.activate()
+
+    scheduler.advance(0.05)
+    reactivated.activate()
+    deactivated.deactivate()
+
+    # Only the entry pushed by the second activation is live
+    scheduler.advance(0.06)
+    assert fired == []
+    scheduler.advance(0.05)
+    assert fired == ["reactivated"]
+    assert not scheduler.queue